@@ -10,7 +10,7 @@ from source.controller.welcome_controller import WelcomeController
 from source.controller.wizard_controller import WizardController
 from source.domain import utils_file
 from source.domain.exports import export_g6_to_png, export_g6_to_tikz, export_g6_to_pdf, export_g6_to_sheet
-from source.domain.utils import trigger_message_box, handle_invalid_export_format
+from source.domain.utils import trigger_message_box, handle_invalid_export_format, validate_file
 from source.domain.utils_file import import_gml_graph, create_gml_file
 from source.store.project_information_store import project_information_store
 from source.store.project_information_store import update_project_store
@@ -104,6 +104,10 @@ class Controller:
         self.wizard_controller.show_window()
 
     def start_project(self):
+        if project_information_store.temp_method != 'blank' and validate_file(project_information_store.file_path):
+            # NOTE: the graphs found by the filtering are read from its output file only now that the project opens
+            with open(project_information_store.file_path) as file:
+                project_information_store.temp_filtered_graphs = file.read().splitlines()
         if not project_information_store.temp_filtered_graphs:
             trigger_message_box("No graph in the input list satisfies the chosen conditions.",
                                 window_title="Empty filtering")
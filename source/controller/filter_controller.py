@@ -1,10 +1,12 @@
+from source.domain.checkpoint import Checkpoint
 from source.domain.filter_list import FilterList
 from source.domain.utils import *
 from source.domain.utils_file import *
 from source.store.project_information_store import project_information_store
 from source.view.loading.loading_window import LoadingWindow
-from PyQt5.QtWidgets import QApplication
+from PyQt5.QtWidgets import QApplication, QMessageBox
 import threading as td
+import time
 
 
 class FilterController:
@@ -13,56 +15,152 @@ class FilterController:
         self.filter_list = None
         self.loading_window = None
         self.is_complete_filtering = False
+        self.graphs_file = None
+        self.graphs_file_lock = td.Lock()
+        self.checkpoint = None
+        self.checkpoint_seconds = 5
+        self.time_checkpoint = 0.0
+        # NOTE: resumed_graphs: graphs examined and satisfied by the runs before this one, from the checkpoint
+        self.resumed_graphs = (0, 0)
+        # NOTE: written_graphs: graphs written to the output file by this run
+        self.written_graphs = 0
 
     def start_filter(self):
+        self.is_complete_filtering = False
         self.filter_list = FilterList()
+        self.filter_list.parallel_mode = project_information_store.temp_parallel_mode
+        self.filter_list.number_workers = project_information_store.temp_number_workers or None
+        self.filter_list.is_cancellable = True
         self.loading_window = LoadingWindow()
-        g6_list = extract_files_to_list(project_information_store.temp_graph_input_files)
-        number_input_graphs = len(g6_list)
+        input_files = project_information_store.temp_graph_input_files
+        graphs_per_file = count_graphs_per_file(input_files)
+        number_input_graphs = sum(graphs_per_file)
+
+        project_path = f'{project_information_store.get_file_directory()}/{project_information_store.temp_project_name}'
+        graphs_file_path = f'{project_path}_graphs.g6'
+        job = Checkpoint.job_of(project_information_store.temp_method, project_information_store.temp_equation,
+                                project_information_store.temp_conditions, input_files)
+        self.checkpoint = self.load_checkpoint(f'{project_path}_checkpoint.json', job, graphs_per_file,
+                                               graphs_file_path, number_input_graphs)
+        graphs_done = self.checkpoint.graphs_done()
+        self.resumed_graphs = (graphs_done, self.checkpoint.satisfied_graphs)
+        self.written_graphs = 0
+        if graphs_done > 0:
+            os.truncate(graphs_file_path, self.checkpoint.output_bytes)
         self.loading_window.set_maximum(100)
         self.loading_window.show()
 
-        if project_information_store.temp_method == 'filter':
-            single_thread = td.Thread(target=self.filter_list.start_filter,
-                                      args=(g6_list, project_information_store.temp_equation,
-                                            project_information_store.temp_conditions,))
-        else:
-            single_thread = td.Thread(target=self.filter_list.start_find_example,
-                                      args=(g6_list, project_information_store.temp_equation,
-                                            project_information_store.temp_conditions))
+        # NOTE: the input is read chunk by chunk and the graphs found are appended to the file as they are
+        #  confirmed, so the memory does not grow with the size of the input
+        self.graphs_file = open(graphs_file_path, 'a' if graphs_done > 0 else 'w')
+        self.time_checkpoint = time.monotonic()
+        # NOTE: daemon, so a job in thread mode stuck in one graph after a cancellation does not keep the program
+        #  alive; the serial and process modes run in worker processes, terminated with the pool
+        single_thread = td.Thread(target=self.filter_list.start_stream,
+                                  args=(project_information_store.temp_method,
+                                        read_files_in_chunks(input_files, graphs_to_skip=self.checkpoint.offsets),
+                                        number_input_graphs - graphs_done, project_information_store.temp_equation,
+                                        project_information_store.temp_conditions, self.write_graphs,),
+                                  daemon=True)
         single_thread.start()
-        is_running = True
-        while is_running:
+        time_start = time.monotonic()
+        is_cancelled = False
+        while single_thread.is_alive():
+            # NOTE: the progress is sampled on a timer, the wait gives the core back to the workers
+            single_thread.join(0.1)
             if self.loading_window.is_forced_to_close:
+                is_cancelled = True
                 self.filter_list.is_forced_to_terminate.value = 1.0
-                single_thread.join()
+                single_thread.join(5)
+                if single_thread.is_alive():
+                    self.warn_threads_still_running()
+                break
+            examined_graphs = self.filter_list.count_examined()
+            self.update(int(((graphs_done + examined_graphs) / number_input_graphs) * 100))
+            self.loading_window.set_throughput(graphs_done + examined_graphs, number_input_graphs,
+                                               examined_graphs / (time.monotonic() - time_start))
+
+        self.close_graphs_file()
+        number_examined_graphs = number_input_graphs
+        if is_cancelled:
+            number_examined_graphs = graphs_done + self.filter_list.examined_in_output
+            number_satisfied_graphs = self.resumed_graphs[1] + self.filter_list.satisfied_graphs
+            if not self.confirm_partial_result(number_examined_graphs, number_input_graphs, number_satisfied_graphs):
+                os.remove(graphs_file_path)
+                self.checkpoint.remove()
                 return
-                # if len(multiprocessing.active_children()) == 0:
-                #    print(multiprocessing.current_process())
-                #    single_thread.join()
-                #    return
-            value = int(((self.filter_list.update_to_progress_bar.value / number_input_graphs) * 100))
-            self.update(value)
-            if value == 100:
-                is_running = False
+        self.checkpoint.remove()
 
         self.is_complete_filtering = True
-        single_thread.join()
-        project_information_store.temp_filtered_graphs = self.filter_list.list_out
+        # NOTE: the report only needs the number of graphs found, the file is read when the project opens
         generate_pdf_report(project_information_store.temp_project_name, project_information_store.temp_method,
                             project_information_store.temp_equation, project_information_store.temp_conditions,
                             project_information_store.temp_graph_input_files,
-                            project_information_store.temp_filtered_graphs, '_report', number_input_graphs,
-                            project_information_store.temp_project_description)
+                            self.resumed_graphs[1] + self.written_graphs, '_report', number_examined_graphs,
+                            project_information_store.temp_project_description, number_input_graphs,
+                            self.filter_list.parallel_plan)
 
-        create_g6_file(project_information_store.get_file_directory(),
-                       project_information_store.temp_filtered_graphs,
-                       project_information_store.temp_project_name, '_graphs')
-        project_information_store.file_path = f'{project_information_store.get_file_directory()}/' \
-                                              f'{project_information_store.temp_project_name}_graphs.g6'
+        project_information_store.file_path = graphs_file_path
 
         self.loading_window.close()
 
+    def load_checkpoint(self, checkpoint_path, job, graphs_per_file, graphs_file_path, number_input_graphs):
+        new_checkpoint = Checkpoint(checkpoint_path, job, graphs_per_file)
+        checkpoint = Checkpoint.load(checkpoint_path, job, graphs_per_file)
+        if checkpoint is None or checkpoint.graphs_done() == 0 or not os.path.isfile(graphs_file_path) or \
+                os.path.getsize(graphs_file_path) < checkpoint.output_bytes:
+            return new_checkpoint
+        dlg = QMessageBox()
+        dlg.setWindowTitle("Resume filtering")
+        dlg.setText(f"A previous run of this filtering stopped after examining {checkpoint.graphs_done()} of "
+                    f"{number_input_graphs} graphs.\nDo you want to resume it from there?")
+        dlg.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
+        dlg.setDefaultButton(QMessageBox.Yes)
+        return checkpoint if dlg.exec_() == QMessageBox.Yes else new_checkpoint
+
+    def write_graphs(self, list_g6):
+        with self.graphs_file_lock:
+            if self.graphs_file.closed:
+                return
+            for g6code in list_g6:
+                self.graphs_file.write(f"{g6code}\n")
+            self.graphs_file.flush()
+            self.written_graphs += len(list_g6)
+            # NOTE: the chunks arrive in input order until the job is cancelled or an example is found,
+            #  only then the graphs examined so far are a prefix of the input that a checkpoint can skip
+            if time.monotonic() - self.time_checkpoint > self.checkpoint_seconds and \
+                    self.filter_list.is_forced_to_terminate.value != 1.0 and not self.filter_list.is_example_found.value:
+                os.fsync(self.graphs_file.fileno())
+                self.checkpoint.save(self.resumed_graphs[0] + self.filter_list.examined_in_output,
+                                     self.graphs_file.tell(), self.resumed_graphs[1] + self.filter_list.satisfied_graphs)
+                self.time_checkpoint = time.monotonic()
+
+    def close_graphs_file(self):
+        with self.graphs_file_lock:
+            self.graphs_file.close()
+
+    @staticmethod
+    def warn_threads_still_running():
+        # NOTE: only in thread mode, a thread cannot be stopped from outside while it computes an invariant
+        dlg = QMessageBox()
+        dlg.setWindowTitle("Filtering cancelled")
+        dlg.setIcon(QMessageBox.Warning)
+        dlg.setText("The filtering was cancelled, but in thread mode a graph stuck in an expensive invariant cannot "
+                    "be stopped.\nIts thread keeps running in the background until GraphFilter is closed.")
+        dlg.exec_()
+
+    def confirm_partial_result(self, number_examined_graphs, number_input_graphs, number_satisfied_graphs):
+        if number_satisfied_graphs == 0:
+            return False
+        dlg = QMessageBox()
+        dlg.setWindowTitle("Filtering cancelled")
+        dlg.setText(f"The filtering was cancelled after examining {number_examined_graphs} of "
+                    f"{number_input_graphs} graphs.\nDo you want to save the {number_satisfied_graphs} "
+                    f"graphs found so far as a project?")
+        dlg.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
+        dlg.setDefaultButton(QMessageBox.Yes)
+        return dlg.exec_() == QMessageBox.Yes
+
     def update(self, value):
         self.loading_window.increase_step(value)
         QApplication.processEvents()
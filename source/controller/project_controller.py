@@ -18,6 +18,7 @@ from source.view.project.docks.graph_information_dock import GraphInformationDoc
 from source.view.project.docks.visualize_graph_dock import VisualizeGraphDock
 from source.view.project.docks.tree_file_dock import TreeFileDock
 from source.view.project.docks.invariants_checks_dock import InvariantsCheckDock
+from source.store.operations_and_invariants.invariants import GraphContext
 from source.store.operations_invariants import *
 from source.store.new_graph_store import *
 from source.domain.utils import match_graph_code, add_vertex, handle_invalid_graph_open, trigger_message_box, \
@@ -497,14 +498,16 @@ class ProjectController:
     def update_graph_to_table(self):
         graph = project_information_store.current_graph
 
-        for key in self.invariants_selected.keys():
-            if len(graph) == 0:
-                self.invariants_selected[key] = "Null Graph"
-            else:
-                try:
-                    self.invariants_selected[key] = dic_invariants_to_visualize[key].print(graph, precision=5)
-                except:
-                    self.invariants_selected[key] = "ERROR in calculation, please report problem."
+        # NOTE: the selected invariants share the matrices and spectra computed for the graph
+        with GraphContext():
+            for key in self.invariants_selected.keys():
+                if len(graph) == 0:
+                    self.invariants_selected[key] = "Null Graph"
+                else:
+                    try:
+                        self.invariants_selected[key] = dic_invariants_to_visualize[key].print(graph, precision=5)
+                    except:
+                        self.invariants_selected[key] = "ERROR in calculation, please report problem."
 
         self.graph_information_dock.update_table(self.invariants_selected)
 
@@ -169,6 +169,10 @@ class WizardController:
         self.graph_files_page.download_button_mckay.clicked.connect(
             lambda: open_url("http://users.cecs.anu.edu.au/~bdm/data/graphs.html"))
 
+    def connect_review_page_events(self):
+        self.review_page.parallel_mode.currentIndexChanged.connect(self.save_parallelism)
+        self.review_page.number_workers.valueChanged.connect(self.save_parallelism)
+
     def connect_events(self):
         self.wizard_window.currentIdChanged.connect(self.on_wizard_page_change)
         self.wizard_window.help_button.clicked.connect(self.open_message_box)
@@ -176,6 +180,7 @@ class WizardController:
         self.connect_equations_page_events()
         self.connect_method_page_events()
         self.connect_graph_files_page_events()
+        self.connect_review_page_events()
 
     def open_message_box(self):
         message_box = MessageBox(self.wizard_window.currentPage().alert_text)
@@ -204,6 +209,10 @@ class WizardController:
         wizard_information_store.temp_project_description = description
         self.review_page.set_project_description(description)
 
+    def save_parallelism(self):
+        wizard_information_store.temp_parallel_mode = self.review_page.parallel_mode.currentData()
+        wizard_information_store.temp_number_workers = self.review_page.number_workers.value()
+
     def on_open_project_file(self):
         file_dialog = QFileDialog.getExistingDirectory(
             directory=wizard_information_store.file_path)
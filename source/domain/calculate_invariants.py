@@ -1,16 +1,16 @@
 import networkx as nx
 
+from source.store.operations_and_invariants.invariants import GraphContext
+
 
 def run_from_g6(g6code, list_invariants):
     graph = nx.from_graph6_bytes(g6code.encode('utf-8'))
-    dic = {}
-    for inv in list_invariants:
-        dic[inv.name] = str(inv.calculate(graph))
-    return dic
+    return run_from_graph(graph, list_invariants)
 
 
 def run_from_graph(graph, list_invariants):
     dic = {}
-    for inv in list_invariants:
-        dic[inv.name] = str(inv.calculate(graph))
+    with GraphContext():
+        for inv in list_invariants:
+            dic[inv.name] = str(inv.calculate(graph))
     return dic
@@ -0,0 +1,54 @@
+import json
+import os
+
+
+class Checkpoint:
+    """Progress of a filtering job, saved next to its output so the job can resume after a restart.
+
+    It covers the chunks written in input order: the first `offsets[i]` graphs of each input file were examined
+    and their matches are the first `output_bytes` bytes of the output file.
+    """
+
+    def __init__(self, path, job, graphs_per_file, offsets=None, output_bytes=0, satisfied_graphs=0):
+        self.path = path
+        self.job = job
+        self.graphs_per_file = graphs_per_file
+        self.offsets = offsets if offsets is not None else [0] * len(graphs_per_file)
+        self.output_bytes = output_bytes
+        self.satisfied_graphs = satisfied_graphs
+
+    @staticmethod
+    def job_of(method, equation, conditions, input_files):
+        return {'method': method, 'equation': equation, 'conditions': conditions, 'graph_files': input_files}
+
+    @staticmethod
+    def load(path, job, graphs_per_file):
+        # NOTE: a checkpoint of another job, or of input files that changed since, is ignored
+        try:
+            with open(path, 'r') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if data.get('job') != job or data.get('graphs_per_file') != graphs_per_file:
+            return None
+        return Checkpoint(path, job, graphs_per_file, data['offsets'], data['output_bytes'], data['satisfied_graphs'])
+
+    def graphs_done(self):
+        return sum(self.offsets)
+
+    def save(self, graphs_done, output_bytes, satisfied_graphs):
+        self.offsets = []
+        for number_graphs in self.graphs_per_file:
+            self.offsets.append(min(number_graphs, graphs_done))
+            graphs_done -= self.offsets[-1]
+        self.output_bytes = output_bytes
+        self.satisfied_graphs = satisfied_graphs
+        # NOTE: written aside and renamed, a crash while saving leaves the previous checkpoint intact
+        with open(self.path + '.tmp', 'w') as file:
+            json.dump({'job': self.job, 'graphs_per_file': self.graphs_per_file, 'offsets': self.offsets,
+                       'output_bytes': self.output_bytes, 'satisfied_graphs': self.satisfied_graphs}, file)
+        os.replace(self.path + '.tmp', self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -1,9 +1,88 @@
+import ast
+import math
+
 import numpy
-from simpleeval import simple_eval
+from simpleeval import SimpleEval
 
 from source.store.operations_invariants import *
 
 
+class CompiledExpression(SimpleEval):
+    """Expression parsed once and evaluated for many graphs with simpleeval's rules.
+
+    A comparison of an invariant with a constant, such as χ(G) < 4, is answered by the decision versions of the
+    invariant when it has them (is_at_least and is_at_most), which stop as soon as the threshold is proven or
+    refuted instead of computing the optimum.
+    """
+    reversed_comparison = {ast.Lt: ast.Gt, ast.LtE: ast.GtE, ast.Gt: ast.Lt, ast.GtE: ast.LtE, ast.Eq: ast.Eq,
+                           ast.NotEq: ast.NotEq}
+
+    def __init__(self, expression):
+        super().__init__(functions=dic_function_to_eval, names={**{"G": None, "g": None}, **dic_math_const})
+        self.expr = expression
+        self.node = ast.parse(expression.strip()).body[0]
+        self.decision = self.threshold_decision()
+
+    def __call__(self, graph):
+        if self.decision is not None:
+            return self.decision(graph)
+        self.names["G"] = graph
+        self.names["g"] = graph
+        return self._eval(self.node)
+
+    @staticmethod
+    def invariant_with_decision(node):
+        # NOTE: a call F(G) of a numeric invariant that has decision versions, None for any other node
+        if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Name) or node.keywords:
+            return None
+        if len(node.args) != 1 or not isinstance(node.args[0], ast.Name) or node.args[0].id not in ("G", "g"):
+            return None
+        for inv in operations_invariants.numInvariant.all:
+            if inv.code_literal == node.func.id and hasattr(inv, 'is_at_least') and hasattr(inv, 'is_at_most'):
+                return inv
+        return None
+
+    @staticmethod
+    def is_constant(node):
+        return not any(isinstance(child, ast.Call) or (isinstance(child, ast.Name) and child.id in ("G", "g"))
+                       for child in ast.walk(node))
+
+    def threshold_decision(self):
+        compare = self.node.value if isinstance(self.node, ast.Expr) else None
+        if not isinstance(compare, ast.Compare) or len(compare.ops) != 1:
+            return None
+        left, comparison, right = compare.left, type(compare.ops[0]), compare.comparators[0]
+        if comparison not in CompiledExpression.reversed_comparison:
+            return None
+        if CompiledExpression.invariant_with_decision(right) is not None:
+            left, comparison, right = right, CompiledExpression.reversed_comparison[comparison], left
+        inv = CompiledExpression.invariant_with_decision(left)
+        if inv is None or not CompiledExpression.is_constant(right):
+            return None
+        try:
+            value = float(self._eval(right))
+        except Exception:
+            return None
+        if not math.isfinite(value):
+            return None
+
+        # NOTE: the invariant is an integer, the comparison bounds it to the integers from lower to upper
+        lower = math.ceil(value) if comparison in (ast.GtE, ast.Eq, ast.NotEq) else None
+        lower = math.floor(value) + 1 if comparison == ast.Gt else lower
+        upper = math.floor(value) if comparison in (ast.LtE, ast.Eq, ast.NotEq) else None
+        upper = math.ceil(value) - 1 if comparison == ast.Lt else upper
+
+        def decision(graph):
+            satisfied = ((lower is None or inv.is_at_least(graph, lower))
+                         and (upper is None or inv.is_at_most(graph, upper)))
+            return satisfied != (comparison == ast.NotEq)
+
+        return decision
+
+    def __reduce__(self):
+        return CompiledExpression, (self.expr,)
+
+
 class Equation:
 
     @staticmethod
@@ -26,6 +105,13 @@ class Equation:
         else:
             return expression.replace(" ", ""), 'SINGLE'
 
+    @staticmethod
+    def compile_expression(expression):
+        expressions, and_or = Equation.split_translate_expression(expression)
+        if and_or == 'SINGLE':
+            expressions = [expressions] if len(expressions) > 0 else []
+        return [CompiledExpression(exp) for exp in expressions], and_or
+
     @staticmethod
     def validate_expression(expression):
         if len(expression) == 0:
@@ -48,7 +134,5 @@ class Equation:
 
     @staticmethod
     def valid_bool_simple_eval(expression):
-        g = nx.path_graph(2)
-        names = {**{"G": g, "g": g}, **dic_math_const}
-        type_ex = type(simple_eval(expression, functions=dic_function_to_eval, names=names))
+        type_ex = type(CompiledExpression(expression)(nx.path_graph(2)))
         return type_ex == numpy.bool or type_ex == numpy.bool_ or type_ex == bool
@@ -0,0 +1,106 @@
+import time
+
+
+class Condition:
+    """Boolean invariant that must be 'true' or 'false' for a graph to be accepted."""
+
+    def __init__(self, invariant, choice):
+        self.invariant = invariant
+        self.expected = choice == 'true'
+
+    def __call__(self, graph):
+        return self.invariant.calculate(graph) == self.expected
+
+
+class PlannedCheck:
+    """A check of the plan with the statistics sampled while filtering."""
+
+    def __init__(self, function):
+        self.function = function
+        self.evaluations = 0
+        self.passes = 0
+        self.seconds = 0.0
+
+    def __call__(self, graph):
+        return bool(self.function(graph))
+
+    def record(self, seconds, satisfied):
+        self.evaluations += 1
+        self.passes += satisfied
+        self.seconds += seconds
+
+    def rank(self, mode):
+        if self.evaluations == 0:
+            return 0.0
+        cost = self.seconds / self.evaluations
+        # NOTE: Laplace smoothing keeps checks that never decided the result in the ranking
+        probability_pass = (self.passes + 1) / (self.evaluations + 2)
+        if mode == 'OR':
+            return cost / probability_pass
+        return cost / (1 - probability_pass)
+
+
+class EvaluationPlan:
+    """Short-circuit evaluation of checks joined by AND or OR, cheapest and most decisive first.
+
+    The first graphs and then one graph out of `sample_every` are sampled: every check is timed on them and
+    the checks are re-ranked by expected cost to decide the result, so the order adapts during the run.
+    The result is the one of the checks evaluated in the order given: a check that raises an exception rejects
+    the graph, unless a check given before it already decided an OR.
+    """
+
+    def __init__(self, checks, mode='AND', warm_up=32, sample_every=64):
+        self.checks = [PlannedCheck(check) for check in checks]
+        self.given = list(self.checks)
+        self.mode = mode
+        self.warm_up = warm_up
+        self.sample_every = sample_every
+        self.count_graphs = 0
+
+    def __call__(self, graph):
+        self.count_graphs += 1
+        try:
+            if self.count_graphs <= self.warm_up or self.count_graphs % self.sample_every == 0:
+                return self.sample(graph)
+            return self.evaluate(graph)
+        except Exception:
+            return False
+
+    def evaluate(self, graph):
+        # NOTE: a false or raising check rejects an AND in any order, but an OR satisfied by a check is decided by
+        #  the first check given that is not false, which may raise
+        decisive = self.mode == 'OR'
+        for check in self.checks:
+            if check(graph) == decisive:
+                if not decisive:
+                    return False
+                for given in self.given:
+                    if given is check or given(graph):
+                        return True
+        return not decisive
+
+    def sample(self, graph):
+        decisive = self.mode == 'OR'
+        results = {}
+        for check in self.checks:
+            start = time.perf_counter()
+            try:
+                results[check] = check(graph)
+            except Exception:
+                results[check] = None
+            check.record(time.perf_counter() - start, results[check] is True)
+        self.checks.sort(key=lambda check: check.rank(self.mode))
+        for check in self.given:
+            if results[check] is None:
+                return False
+            if results[check] == decisive:
+                return decisive
+        return not decisive
+
+    @staticmethod
+    def from_job(expressions, and_or, list_inv_bool_choices, dic_bool_invariants):
+        conditions = [Condition(dic_bool_invariants[inv_name], choice)
+                      for inv_name, choice in list_inv_bool_choices.items()]
+        if and_or == 'OR':
+            return EvaluationPlan([EvaluationPlan(expressions, 'OR')] + conditions, 'AND')
+        return EvaluationPlan(expressions + conditions, 'AND')
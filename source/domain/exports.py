@@ -6,6 +6,7 @@ import xlsxwriter
 import network2tikz as nxtikz
 
 from source.domain.utils import convert_g6_to_nx
+from source.store.operations_and_invariants.invariants import GraphContext
 from source.store.operations_invariants import dic_invariants_to_visualize as dic
 
 
@@ -49,19 +50,21 @@ def export_g6_to_sheet(graph_list, invariants, file_name, update_progress, loadi
             return
         sheet.write(step + 1, 0, step + 1)
         sheet.write(step + 1, 1, graph)
-        for k, invariant in enumerate(invariants):
-            if dic[invariant].type in ["number_structural", "number_spectral"]:
-                try:
-                    sheet.write_number(step + 1, k + 2,
-                                       float(dic[invariant].print(convert_g6_to_nx(graph), precision=5)))
-                except:
-                    sheet.write_string(step + 1, k + 2, "ERROR in calculation, please report problem.")
-            elif dic[invariant].type in ['bool_structural', 'bool_spectral']:
-                try:
-                    sheet.write_string(step + 1, k + 2, dic[invariant].print(convert_g6_to_nx(graph), precision=5))
-                except:
-                    sheet.write_string(step + 1, k + 2, "ERROR in calculation, please report problem.")
-            else:
-                sheet.write(step + 1, k + 2, 'no data')
+        nx_graph = convert_g6_to_nx(graph)
+        # NOTE: the invariants of a row share the matrices and spectra computed for the graph
+        with GraphContext():
+            for k, invariant in enumerate(invariants):
+                if dic[invariant].type in ["number_structural", "number_spectral"]:
+                    try:
+                        sheet.write_number(step + 1, k + 2, float(dic[invariant].print(nx_graph, precision=5)))
+                    except:
+                        sheet.write_string(step + 1, k + 2, "ERROR in calculation, please report problem.")
+                elif dic[invariant].type in ['bool_structural', 'bool_spectral']:
+                    try:
+                        sheet.write_string(step + 1, k + 2, dic[invariant].print(nx_graph, precision=5))
+                    except:
+                        sheet.write_string(step + 1, k + 2, "ERROR in calculation, please report problem.")
+                else:
+                    sheet.write(step + 1, k + 2, 'no data')
         update_progress(step)
     workbook.close()
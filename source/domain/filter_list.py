@@ -1,12 +1,16 @@
-import multiprocessing
+import collections
+import copy
+import itertools
 import multiprocessing as mp
 import os
-import random
+import threading
 import time
-
-from simpleeval import simple_eval
+from multiprocessing.pool import ThreadPool
 
 from source.domain.equation import Equation
+from source.domain.evaluation_plan import EvaluationPlan
+from source.domain.parallel_plan import ParallelPlan
+from source.store.operations_and_invariants.invariants import GraphContext
 from source.store.operations_invariants import *
 
 
@@ -16,190 +20,276 @@ class FilterList:
         self.list_g6_in = None
         self.expressions = None
         self.list_inv_bool_choices = None
-        self.functions_to_eval = {}
         self.list_out = []
         self.invariant_bool = None
         self.invariant_num = None
         self.operations_math = None
         self.operations_graph = None
         self.AND_OR = None
+        self.plan = None
         self.total = 0
         self.is_forced_to_terminate = mp.Value("d", 0.0, lock=True)
+        self.is_example_found = mp.Value("b", 0, lock=False)
 
-        self.update_to_progress_bar = mp.Value("d", 0.0, lock=True)
+        self.examined_graphs = mp.Array("q", 1, lock=False)
+        self.next_slot = mp.Value("i", 1, lock=True)
+        self.slot = 0
+        self.examined_local = 0
+        self.time_published = 0.0
+        self.examined_in_output = 0
+        self.parallel_mode = 'auto'
+        self.number_workers = None
+        self.parallel_plan = None
+        self.is_cancellable = False
 
         # NOTE: list_g6_in: list with graphs6 string
         #  expression: (in)equation string with AND OR
         #  list_inv_bool_choices: dict of couples {invariant_name: 'true' or 'false'}
-        self.functions_to_eval.update(dic_function_to_eval)
+        #  expressions: list of CompiledExpression, parsed once per job
+        #  plan: EvaluationPlan of the expressions and conditions, reordered by sampled cost
+        #  examined_graphs: graphs examined so far, one slot written only by each process (0 for this one),
+        #   published in batches so the workers never wait on a lock to count a graph
+        #  examined_in_output: graphs examined in the chunks written out, the input covered by a cancelled job
+        #  is_example_found: set by the first process that finds an example, the others stop at their next graph
+        #  parallel_mode, number_workers: forced by the caller, else calibrated into parallel_plan
+        #  is_cancellable: set by a caller that may cancel the job, a serial job then runs in one worker process,
+        #   so a graph stuck in an expensive invariant is stopped with the process
 
-    def set_inputs(self, list_g6_in, expression, list_inv_bool_choices):
+    def set_inputs(self, list_g6_in, expression, list_inv_bool_choices, total=None):
         self.satisfied_graphs = 0
         self.list_out.clear()
         self.list_g6_in = list_g6_in
-        self.total = len(self.list_g6_in)
+        self.total = len(self.list_g6_in) if total is None else total
         self.list_inv_bool_choices = list_inv_bool_choices
-        self.expressions, self.AND_OR = Equation.split_translate_expression(expression)
+        self.expressions, self.AND_OR = Equation.compile_expression(expression)
+        self.plan = EvaluationPlan.from_job(self.expressions, self.AND_OR, list_inv_bool_choices,
+                                            dic_bool_invariants_names)
+        self.examined_graphs = mp.Array("q", 1, lock=False)
+        self.next_slot = mp.Value("i", 1, lock=True)
+        self.slot = 0
+        self.examined_local = 0
+        self.examined_in_output = 0
+        self.is_example_found = mp.Value("b", 0, lock=False)
 
     def start_filter(self, list_g6_in, expression, list_inv_bool_choices):
         self.set_inputs(list_g6_in, expression, list_inv_bool_choices)
-        number_cores = int(np.ceil((1 / 3) * os.cpu_count()))
-        if self.need_multiprocess(list_g6_in, number_cores) and self.is_forced_to_terminate != 1.0:
-            manager_class = mp.Manager()
-            number_cores = int(np.ceil((1 / 3) * os.cpu_count()))
-            list_broken_in = self.subdivide_input_list(number_cores)
-            list_broken_out = manager_class.list(range(number_cores))
-            list_of_process = []
-            for k, list_in in enumerate(list_broken_in):
-                if self.is_forced_to_terminate.value == 1.0:
-                    return
-                single_process = mp.Process(target=self.filter_multiprocess, args=(list_in, k, list_broken_out,))
-                list_of_process.append(single_process)
-                single_process.start()
-            for single_process in list_of_process:
-                single_process.join()
-                self.update_to_progress_bar.value = self.total
-            for list_in in list_broken_out:
-                self.list_out += list_in
-            return
-        else:
-            list_out = [None] * 1
-            self.filter_multiprocess(self.list_g6_in, 0, list_out)
-            self.list_out = list_out[0]
-            return
-
-    def filter_multiprocess(self, list_g6_in, i, list_out):
-        list_out_temp = []
-        for g6code in list_g6_in:
-            if self.is_forced_to_terminate.value == 1.0:
-                try:
-                    multiprocessing.current_process().terminate()
-                    return
-                except AttributeError:
-                    return
-            self.update_to_progress_bar.value = self.update_to_progress_bar.value + 1
-            if g6code == '' or g6code == ' ':
-                continue
-            try:
-                g = nx.from_graph6_bytes(g6code.encode('utf-8'))
-                if self.graph_satisfies_equation(g):
-                    if self.graph_satisfies_conditions(g):
-                        list_out_temp.append(g6code)
-            except Exception:
-                continue
-        list_out[i] = list_out_temp
+        self.run_chunks(self.chunks(os.cpu_count()), self.list_out.extend, filter_chunk)
 
     def start_find_example(self, list_g6_in, expression, list_inv_bool_choices):
         self.set_inputs(list_g6_in, expression, list_inv_bool_choices)
-        number_cores = int(np.ceil((1 / 3) * os.cpu_count()))
-        if self.need_multiprocess(list_g6_in, number_cores):
-            manager_class = mp.Manager()
-            list_broken_in = self.subdivide_input_list(number_cores)
-            list_broken_out = manager_class.list(range(number_cores))
-            list_of_process = []
-            for k, list_in in enumerate(list_broken_in):
-                single_process = mp.Process(target=self.find_example_multiprocess, args=(list_in, k, list_broken_out,))
-                list_of_process.append(single_process)
-                single_process.start()
-            for single_process in list_of_process:
-                single_process.join()
-                self.update_to_progress_bar.value = self.total
-            for element in list_broken_out:
-                if element != "":
-                    self.list_out.append(element)
-                    return True
-            return False
+        self.run_chunks(self.chunks(os.cpu_count()), self.list_out.extend, find_example_chunk)
+        return self.satisfied_graphs > 0
+
+    def start_stream(self, method, chunks_g6_in, total, expression, list_inv_bool_choices, write_graphs):
+        # NOTE: chunks_g6_in: iterable of lists of graph6 strings, read lazily from the input files
+        #  total: number of input graphs, for the progress bar
+        #  write_graphs: called with the graphs confirmed in each chunk, in input order
+        self.set_inputs(None, expression, list_inv_bool_choices, total)
+        chunk_function = filter_chunk if method == 'filter' else find_example_chunk
+        self.run_chunks(chunks_g6_in, write_graphs, chunk_function)
+        return self.satisfied_graphs > 0
+
+    def run_chunks(self, chunks_g6_in, write_graphs, chunk_function):
+        chunks_g6_in = iter(chunks_g6_in)
+        first_chunk = next(chunks_g6_in, [])
+        chunks_g6_in = itertools.chain([first_chunk], chunks_g6_in)
+        # NOTE: one slot per worker the plan may choose, allocated before the calibration worker starts
+        self.examined_graphs = mp.Array("q", (self.number_workers or os.cpu_count()) + 1, lock=False)
+        pool = None
+        if self.is_cancellable and self.parallel_mode == 'auto':
+            # NOTE: a cancellable job is calibrated in the worker process of the serial mode, so a graph of the
+            #  sample stuck in an expensive invariant is stopped with the process; a serial job keeps the worker
+            pool = mp.Pool(1, initializer=init_worker, initargs=(self,))
+            self.parallel_plan = self.calibrate_in_worker(pool, first_chunk)
+            if self.parallel_plan.mode != 'serial':
+                pool.terminate()
+                pool = None
+                self.next_slot.value = 1
         else:
-            list_out = [None] * 1
-            self.find_example_multiprocess(self.list_g6_in, 0, list_out)
-            if list_out[0] == "":
-                return False
-            else:
-                self.list_out.append(list_out[0])
-                return True
-
-    def find_example_multiprocess(self, list_g6_in, i, list_out):
-        list_out[i] = ""
-        for g6code in list_g6_in:
+            self.parallel_plan = ParallelPlan.calibrate(self.evaluate, first_chunk, self.total, self.parallel_mode,
+                                                        self.number_workers)
+        number_workers = self.parallel_plan.number_workers
+        is_pool = self.parallel_plan.mode != 'serial' or self.is_cancellable
+        if is_pool and self.is_forced_to_terminate.value != 1.0:
+            is_thread = self.parallel_plan.mode == 'thread'
+            pool_class = ThreadPool if is_thread else mp.Pool
+            if pool is None:
+                pool = pool_class(number_workers, initializer=init_worker, initargs=(self, is_thread))
+            # NOTE: leaving the pool terminates the workers still busy, as when an example is found
+            with pool:
+                for chunk_out in self.imap_in_order(pool, chunk_function, chunks_g6_in, 4 * number_workers):
+                    if self.write_chunk(chunk_out, write_graphs, chunk_function):
+                        break
+        else:
+            if pool is not None:
+                pool.terminate()
+            for list_g6_in in chunks_g6_in:
+                if self.is_forced_to_terminate.value == 1.0:
+                    break
+                if self.write_chunk(chunk_function(list_g6_in, self), write_graphs, chunk_function):
+                    break
+
+    def calibrate_in_worker(self, pool, sample):
+        result = pool.apply_async(sample_seconds_chunk, (sample,))
+        while not result.ready():
             if self.is_forced_to_terminate.value == 1.0:
-                try:
-                    multiprocessing.current_process().terminate()
-                    return
-                except AttributeError:
-                    return
-            if self.update_to_progress_bar == self.total:
+                return ParallelPlan('serial', 1)
+            result.wait(0.1)
+        return ParallelPlan.from_seconds(result.get(), self.total, self.number_workers)
+
+    def write_chunk(self, chunk_out, write_graphs, chunk_function):
+        list_out, number_examined = chunk_out
+        self.satisfied_graphs += len(list_out)
+        self.examined_in_output += number_examined
+        write_graphs(list_out)
+        return chunk_function is find_example_chunk and len(list_out) > 0
+
+    def imap_in_order(self, pool, function, chunks_g6_in, window, grace_seconds=1.0):
+        # NOTE: chunks are handed out on demand, but at most `window` of them are read ahead of the oldest
+        #  unfinished one, which bounds the memory and keeps the output in input order.
+        #  When the job is cancelled the workers return what they found so far; after `grace_seconds` a worker
+        #  stuck in one graph is abandoned, the chunks already finished are still yielded
+        pending = collections.deque()
+        time_cancelled = None
+        while True:
+            is_cancelled = self.is_forced_to_terminate.value == 1.0
+            if self.is_example_found.value:
+                # NOTE: the job ends with the first example, it is not kept waiting behind an older chunk
+                for result in [result for result in pending if result.ready()]:
+                    pending.remove(result)
+                    yield result.get()
+            elif not is_cancelled and len(pending) < window:
+                list_g6_in = next(chunks_g6_in, None)
+                if list_g6_in is not None:
+                    pending.append(pool.apply_async(function, (list_g6_in,)))
+                    continue
+            if not pending:
                 return
-            self.update_to_progress_bar.value = self.update_to_progress_bar.value + 1
-            if g6code == '' or g6code == ' ':
-                continue
-            try:
-                g = nx.from_graph6_bytes(g6code.encode('utf-8'))
-                if self.graph_satisfies_equation(g):
-                    if self.graph_satisfies_conditions(g):
-                        # list_out_temp.append(g6code)
-                        list_out[i] = g6code
-                        self.update_to_progress_bar.value = self.total
-                        return
-                        # break
-            except Exception:
-                continue
-        # list_out[i] = list_out_temp
-
-    def subdivide_input_list(self, parts):
-        n_sub = int(np.ceil(self.total / parts))
-        return [self.list_g6_in[i:i + n_sub] for i in range(0, self.total, n_sub)]
-
-    def graph_satisfies_equation(self, g):
-        names = {**{"G": g, "g": g}, **dic_math_const}
-        if len(self.expressions) > 0:
-            if self.AND_OR == 'SINGLE':
-                return simple_eval(self.expressions, functions=self.functions_to_eval, names=names)
-            elif self.AND_OR == 'AND':
-                for exp in self.expressions:
-                    if not simple_eval(exp, functions=self.functions_to_eval, names=names):
-                        return False
-                return True
-            elif self.AND_OR == "OR":
-                for exp in self.expressions:
-                    if simple_eval(exp, functions=self.functions_to_eval, names=names):
-                        return True
-                return False
-        return True
-
-    def graph_satisfies_conditions(self, g):
-        for inv_name in self.list_inv_bool_choices:
-            if self.list_inv_bool_choices[inv_name] == 'true':
-                graph_satisfies = dic_bool_invariants_names[inv_name].calculate(g)
-            else:
-                graph_satisfies = not dic_bool_invariants_names[inv_name].calculate(g)
-            if not graph_satisfies:
-                return False
-        return True
-
-    def need_multiprocess(self, list_g6_in, number_process):
-        if len(list_g6_in) < number_process:
-            return False
-        graph_is_valid = False
-        fails = 0
-        while not graph_is_valid:
-            choices = random.choices(population=list_g6_in, k=2)
+            if is_cancelled:
+                if time_cancelled is None:
+                    time_cancelled = time.monotonic()
+                if time.monotonic() - time_cancelled > grace_seconds:
+                    for result in pending:
+                        if result.ready():
+                            yield result.get()
+                    return
+            pending[0].wait(0.1)
+            if pending[0].ready():
+                yield pending.popleft().get()
+
+    def filter_multiprocess(self, list_g6_in):
+        list_out_temp = []
+        number_examined = 0
+        graphs = self.read_chunk(list_g6_in)
+        # NOTE: the graphs of a chunk share one context, so the spectra of graphs of the same order are batched
+        with GraphContext(batch=[g for g6code, g in graphs if g is not None]) as context:
+            for g6code, g in graphs:
+                if self.is_forced_to_terminate.value == 1.0:
+                    break
+                self.count_examined_graph()
+                number_examined += 1
+                if g is None:
+                    continue
+                context.examined += 1
+                if self.plan(g):
+                    list_out_temp.append(g6code)
+        self.publish_examined()
+        return list_out_temp, number_examined
+
+    def find_example_multiprocess(self, list_g6_in):
+        number_examined = 0
+        graphs = self.read_chunk(list_g6_in)
+        with GraphContext(batch=[g for g6code, g in graphs if g is not None]) as context:
+            for g6code, g in graphs:
+                if self.is_forced_to_terminate.value == 1.0 or self.is_example_found.value:
+                    break
+                self.count_examined_graph()
+                number_examined += 1
+                if g is None:
+                    continue
+                context.examined += 1
+                if self.plan(g):
+                    self.is_example_found.value = 1
+                    self.publish_examined()
+                    return [g6code], number_examined
+        self.publish_examined()
+        return [], number_examined
+
+    @staticmethod
+    def read_chunk(list_g6_in):
+        # NOTE: a blank line or a code that is not graph6 is read as None and examined without being evaluated
+        graphs = []
+        for g6code in list_g6_in:
             try:
-                g1 = nx.from_graph6_bytes(choices[0].encode('utf-8'))
-                g2 = nx.from_graph6_bytes(choices[1].encode('utf-8'))
-                graph_is_valid = True
+                g = nx.from_graph6_bytes(g6code.encode('utf-8')) if g6code.strip() else None
             except Exception:
-                graph_is_valid = False
-                fails += 1
-                if fails > 10:
-                    return False
-
-        start = time.time()
-        self.graph_satisfies_equation(g1)
-        self.graph_satisfies_conditions(g1)
-        self.graph_satisfies_equation(g2)
-        self.graph_satisfies_conditions(g2)
-        end = time.time()
-        if (end - start) * len(list_g6_in) > 30:
-            return True
-        else:
+                g = None
+            graphs.append((g6code, g))
+        return graphs
+
+    def take_slot(self):
+        with self.next_slot.get_lock():
+            self.slot = self.next_slot.value
+            self.next_slot.value += 1
+        self.examined_local = 0
+
+    def count_examined_graph(self, interval=0.1):
+        self.examined_local += 1
+        if time.monotonic() - self.time_published > interval:
+            self.publish_examined()
+
+    def publish_examined(self):
+        self.examined_graphs[self.slot] = self.examined_local
+        self.time_published = time.monotonic()
+
+    def count_examined(self):
+        return sum(self.examined_graphs[:])
+
+    def chunks(self, number_process, chunks_per_process=16, max_chunk_size=256):
+        # NOTE: small chunks handed out on demand keep every core busy even when the cost of the
+        #  graphs is uneven along the input, as in geng output
+        chunk_size = int(np.ceil(self.total / (number_process * chunks_per_process)))
+        chunk_size = max(1, min(chunk_size, max_chunk_size))
+        for i in range(0, self.total, chunk_size):
+            yield self.list_g6_in[i:i + chunk_size]
+
+    def __getstate__(self):
+        # NOTE: the workers receive the graphs chunk by chunk, never the whole input
+        state = self.__dict__.copy()
+        state['list_g6_in'] = None
+        state['list_out'] = []
+        return state
+
+    def evaluate(self, g6code):
+        try:
+            g = nx.from_graph6_bytes(g6code.encode('utf-8'))
+            with GraphContext():
+                return self.plan(g)
+        except Exception:
             return False
+
+    def copy_for_thread(self):
+        # NOTE: threads share the process, each one needs its own plan, which reorders its checks while it runs
+        filter_list = copy.copy(self)
+        filter_list.plan = copy.deepcopy(self.plan)
+        return filter_list
+
+
+worker = threading.local()
+
+
+def init_worker(filter_list, is_thread=False):
+    worker.filter_list = filter_list.copy_for_thread() if is_thread else filter_list
+    worker.filter_list.take_slot()
+
+
+def filter_chunk(list_g6_in, filter_list=None):
+    return (filter_list or worker.filter_list).filter_multiprocess(list_g6_in)
+
+
+def find_example_chunk(list_g6_in, filter_list=None):
+    return (filter_list or worker.filter_list).find_example_multiprocess(list_g6_in)
+
+
+def sample_seconds_chunk(list_g6_in, filter_list=None):
+    return ParallelPlan.sample_seconds((filter_list or worker.filter_list).evaluate, list_g6_in)
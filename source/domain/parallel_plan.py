@@ -0,0 +1,86 @@
+import math
+import multiprocessing as mp
+import os
+import random
+import statistics
+import time
+
+
+class ParallelPlan:
+    """How a job runs: in 'serial', 'thread' or 'process' mode, with a number of workers.
+
+    The plan is calibrated on a sample of the input: the cost per graph and its deviation are measured and the
+    expected serial time is weighed against the time to start the worker processes.
+    The invariants are pure Python and hold the GIL, so the calibration never picks the thread mode by itself;
+    it is available to be forced from the wizard.
+    """
+
+    modes = ['auto', 'serial', 'thread', 'process']
+    spawn_seconds = None
+
+    def __init__(self, mode, number_workers, sample_size=0, mean_seconds=0.0, deviation_seconds=0.0, forced=False):
+        self.mode = mode
+        self.number_workers = number_workers if mode != 'serial' else 1
+        self.sample_size = sample_size
+        self.mean_seconds = mean_seconds
+        self.deviation_seconds = deviation_seconds
+        self.forced = forced
+
+    def __str__(self):
+        text = f"{self.mode} mode with {self.number_workers} worker{'s' if self.number_workers > 1 else ''}"
+        if self.forced:
+            return text + " (chosen in the wizard)"
+        return text + f" (calibrated on {self.sample_size} graphs: {self.mean_seconds * 1000:.3f} ms " \
+                      f"± {self.deviation_seconds * 1000:.3f} ms per graph)"
+
+    @staticmethod
+    def measure_spawn_seconds():
+        # NOTE: measured once per session, the first pool of the session pays for it
+        if ParallelPlan.spawn_seconds is None:
+            start = time.perf_counter()
+            with mp.Pool(1) as pool:
+                pool.apply(os.getpid)
+            ParallelPlan.spawn_seconds = time.perf_counter() - start
+        return ParallelPlan.spawn_seconds
+
+    @staticmethod
+    def calibrate(evaluate, sample, total, mode='auto', number_workers=None, budget_seconds=1.0, max_sample=64):
+        # NOTE: evaluate: runs the job on one graph6 string
+        #  sample: graph6 strings taken from the input, total: number of input graphs
+        #  mode, number_workers: the choices of the wizard, 'auto' and None to calibrate them
+        if mode != 'auto':
+            return ParallelPlan(mode, number_workers or os.cpu_count(), forced=True)
+        seconds = ParallelPlan.sample_seconds(evaluate, sample, budget_seconds, max_sample)
+        return ParallelPlan.from_seconds(seconds, total, number_workers, budget_seconds)
+
+    @staticmethod
+    def sample_seconds(evaluate, sample, budget_seconds=1.0, max_sample=64):
+        # NOTE: the seconds taken by each graph of the sample, until the budget is spent
+        seconds = []
+        start = time.perf_counter()
+        for g6code in random.sample(sample, min(max_sample, len(sample))):
+            start_graph = time.perf_counter()
+            evaluate(g6code)
+            seconds.append(time.perf_counter() - start_graph)
+            if time.perf_counter() - start > budget_seconds:
+                break
+        return seconds
+
+    @staticmethod
+    def from_seconds(seconds, total, number_workers=None, budget_seconds=1.0):
+        number_workers = number_workers or os.cpu_count()
+        if len(seconds) < 2:
+            return ParallelPlan('serial', 1, len(seconds), sum(seconds))
+        mean_seconds = statistics.fmean(seconds)
+        deviation_seconds = statistics.stdev(seconds)
+
+        number_workers = min(number_workers, total)
+        # NOTE: the lower confidence bound of the mean keeps a few slow graphs in the sample from starting
+        #  processes for a job that is cheap on average
+        serial_seconds = max(0.0, mean_seconds - 2 * deviation_seconds / math.sqrt(len(seconds))) * total
+        mode = 'serial'
+        if number_workers > 1 and serial_seconds > budget_seconds:
+            process_seconds = ParallelPlan.measure_spawn_seconds() * number_workers + serial_seconds / number_workers
+            if process_seconds < serial_seconds:
+                mode = 'process'
+        return ParallelPlan(mode, number_workers, len(seconds), mean_seconds, deviation_seconds)
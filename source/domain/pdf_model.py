@@ -1,7 +1,5 @@
 from fpdf import FPDF
 
-from source.domain.utils import extract_files_to_list
-
 
 class PDF(FPDF):
     def header(self):
@@ -47,16 +45,23 @@ class PDF(FPDF):
         self.multi_cell(0, 10, files_txt.strip())
         self.ln()
 
-    def information_about_graphs(self, filtered_graphs, method, num_graphs):
-        percent = (len(filtered_graphs) / num_graphs) * 100
+    def information_about_graphs(self, number_filtered_graphs, method, num_graphs, num_input_graphs=None):
+        percent = (number_filtered_graphs / num_graphs) * 100
 
         self.set_fill_color(200, 220, 255)
-        self.cell(0, 10, f"Number of input graphs: {num_graphs}", ln=True)
+        if num_input_graphs is not None and num_input_graphs != num_graphs:
+            self.cell(0, 10, f"Cancelled after examining {num_graphs} of {num_input_graphs} input graphs", ln=True)
+        else:
+            self.cell(0, 10, f"Number of input graphs: {num_graphs}", ln=True)
         if method == 'filter':
-            self.cell(0, 10, f"Number of filtered graphs: {len(filtered_graphs)}", ln=True)
+            self.cell(0, 10, f"Number of filtered graphs: {number_filtered_graphs}", ln=True)
             self.cell(0, 10, f"Percentage of success: {round(percent,5)}%")
         else:
-            if len(filtered_graphs) > 0:
+            if number_filtered_graphs > 0:
                 self.cell(0, 10, "An example graph was found.")
             else:
                 self.cell(0, 10, "No example graphs found.")
+
+    def information_about_execution(self, parallel_plan):
+        self.ln()
+        self.multi_cell(0, 10, f"Execution: {parallel_plan}")
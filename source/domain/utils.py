@@ -4,6 +4,7 @@ import random
 import re
 import networkx as nx
 import gzip
+import itertools
 
 from PyQt5.QtWidgets import QApplication, QMessageBox
 
@@ -40,15 +41,32 @@ def clear_layout(layout):
             child.widget().deleteLater()
 
 
-def extract_files_to_list(files):
-    list_g6 = []
+def open_graph_file(file):
+    if file.endswith('.gz'):
+        return gzip.open(file, 'rt', encoding='utf-8')
+    return open(file, 'r')
+
+
+def read_files_in_chunks(files, chunk_size=256, graphs_to_skip=None):
+    # NOTE: graphs_to_skip: number of graphs already examined at the start of each file, when resuming a job
+    chunk = []
+    for k, file in enumerate(files):
+        with open_graph_file(file) as lines:
+            for line in itertools.islice(lines, graphs_to_skip[k] if graphs_to_skip else 0, None):
+                chunk.append(line.rstrip('\r\n'))
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = []
+    if chunk:
+        yield chunk
+
+
+def count_graphs_per_file(files):
+    graphs_per_file = []
     for file in files:
-        if file.endswith('.gz'):
-            file_ungzipped = gzip.open(file, 'r')
-            list_g6.extend(file_ungzipped.read().decode('utf-8').splitlines())
-        else:
-            list_g6.extend(open(file, 'r').read().splitlines())
-    return list_g6
+        with open_graph_file(file) as lines:
+            graphs_per_file.append(sum(1 for _ in lines))
+    return graphs_per_file
 
 
 def match_graph_code(text):
@@ -88,8 +88,8 @@ def create_g6_file(path_to_save, graph_list, name_file=None, name_modifier=''):
             fp.write(f"{graph}\n")
 
 
-def generate_pdf_report(name, method, equation, conditions, input_graph_file, filtered_graphs, name_modifier,
-                        num_graphs, description):
+def generate_pdf_report(name, method, equation, conditions, input_graph_file, number_filtered_graphs, name_modifier,
+                        num_graphs, description, num_input_graphs=None, parallel_plan=None):
     pdf = PDF('P', 'mm', 'A4')
     pdf.add_page()
 
@@ -99,7 +99,9 @@ def generate_pdf_report(name, method, equation, conditions, input_graph_file, fi
                                     conditions,
                                     description,
                                     input_graph_file)
-    pdf.information_about_graphs(filtered_graphs, method, num_graphs)
+    pdf.information_about_graphs(number_filtered_graphs, method, num_graphs, num_input_graphs)
+    if parallel_plan is not None:
+        pdf.information_about_execution(parallel_plan)
     pdf.output(project_information_store.get_file_directory() +
                '/' + f'{name}{name_modifier}.pdf')
 
@@ -0,0 +1,294 @@
+from source.store.operations_and_invariants.invariants import GraphContext
+
+
+class BitsetGraph:
+    """Graph whose adjacency rows are integers: bit j of rows[i] is set when nodes[i] and nodes[j] are adjacent.
+
+    Sets of vertices are integers as well, so the operations of the exact algorithms on sets of vertices are
+    single operations on integers.
+    """
+
+    def __init__(self, nodes, rows):
+        self.nodes = nodes
+        self.rows = rows
+        self.full = (1 << len(nodes)) - 1
+        self.clique = None
+
+    @staticmethod
+    @GraphContext.cached
+    def of(graph):
+        nodes = list(graph)
+        index = {node: i for i, node in enumerate(nodes)}
+        rows = [0] * len(nodes)
+        for u, v in graph.edges():
+            if u != v:
+                rows[index[u]] |= 1 << index[v]
+                rows[index[v]] |= 1 << index[u]
+        return BitsetGraph(nodes, rows)
+
+    def complement(self):
+        return BitsetGraph(self.nodes, [self.full & ~row & ~(1 << i) for i, row in enumerate(self.rows)])
+
+    @staticmethod
+    def vertices_of(vertices):
+        while vertices:
+            lowest = vertices & -vertices
+            yield lowest.bit_length() - 1
+            vertices ^= lowest
+
+    def maximum_clique(self):
+        return [self.nodes[vertex] for vertex in self.maximum_clique_vertices()]
+
+    def maximum_clique_vertices(self):
+        # NOTE: computed once per BitsetGraph, the clique number and the chromatic number share it
+        if self.clique is None:
+            self.clique = self.search_maximum_clique()
+        return self.clique
+
+    def search_maximum_clique(self, at_least=None):
+        # NOTE: branch and bound of Tomita (MCQ/MCS): the candidates are greedily colored, a vertex of color k
+        #  can extend the current clique by at most k vertices, so the branch stops when that cannot beat the best.
+        #  The vertices are renumbered by decreasing degree so the coloring takes them in that order.
+        #  at_least: decision version, branches that cannot reach that size are cut and the search stops at the
+        #  first clique of that size, a smaller clique is returned when there is none
+        order = sorted(range(len(self.rows)), key=lambda i: -bin(self.rows[i]).count('1'))
+        position = {vertex: i for i, vertex in enumerate(order)}
+        rows = [0] * len(order)
+        for i, vertex in enumerate(order):
+            for neighbour in BitsetGraph.vertices_of(self.rows[vertex]):
+                rows[i] |= 1 << position[neighbour]
+
+        best = []
+        clique = []
+        bound = 0 if at_least is None else at_least - 1
+
+        def color(candidates):
+            colored = []
+            number_color = 0
+            while candidates:
+                number_color += 1
+                available = candidates
+                while available:
+                    lowest = available & -available
+                    vertex = lowest.bit_length() - 1
+                    available &= ~rows[vertex] & ~lowest
+                    candidates &= ~lowest
+                    colored.append((vertex, number_color))
+            return colored
+
+        def expand(candidates):
+            nonlocal best, bound
+            for vertex, number_color in reversed(color(candidates)):
+                if len(clique) + number_color <= bound:
+                    return False
+                clique.append(vertex)
+                new_candidates = candidates & rows[vertex]
+                if new_candidates:
+                    if expand(new_candidates):
+                        return True
+                elif len(clique) > len(best):
+                    best = clique[:]
+                    bound = max(bound, len(best))
+                    if at_least is not None and len(best) >= at_least:
+                        return True
+                clique.pop()
+                candidates &= ~(1 << vertex)
+            return False
+
+        expand((1 << len(order)) - 1)
+        return [order[i] for i in best]
+
+    def has_clique(self, size):
+        # NOTE: decision version for conditions such as ω(G) >= k, a maximum clique already found settles it
+        if self.clique is not None:
+            return len(self.clique) >= size
+        return len(self.search_maximum_clique(at_least=size)) >= size
+
+    def maximum_independent_set(self):
+        # NOTE: the independent sets of a graph are the cliques of its complement
+        return self.complement().maximum_clique()
+
+    def has_independent_set(self, size):
+        return self.complement().has_clique(size)
+
+    def dsatur(self):
+        # NOTE: greedy coloring of Brélaz: the next vertex is the one with the most colors among its neighbours,
+        #  ties broken by the number of uncolored neighbours; its number of colors bounds the chromatic number
+        classes = []
+        uncolored = self.full
+        while uncolored:
+            vertex = max(BitsetGraph.vertices_of(uncolored),
+                         key=lambda v: (sum(1 for vertices in classes if vertices & self.rows[v]),
+                                        bin(self.rows[v] & uncolored).count('1')))
+            for i, vertices in enumerate(classes):
+                if not vertices & self.rows[vertex]:
+                    classes[i] |= 1 << vertex
+                    break
+            else:
+                classes.append(1 << vertex)
+            uncolored &= ~(1 << vertex)
+        return classes
+
+    def is_colorable(self, number_colors, clique=None, budget=None):
+        # NOTE: backtracking in the order of DSATUR, the vertex with the fewest colors left is colored first and
+        #  a new color is only ever the next one unused, so permutations of the colors are not searched again.
+        #  A maximum clique is colored first, one color per vertex, or the clique given.
+        #  budget: number of vertices colored after which the search gives up and returns None
+        clique = self.maximum_clique_vertices() if clique is None else clique
+        if len(clique) > number_colors:
+            return False
+        if len(self.rows) <= number_colors:
+            return True
+        classes = [0] * number_colors
+        for i, vertex in enumerate(clique):
+            classes[i] = 1 << vertex
+        uncolored = self.full & ~sum(1 << vertex for vertex in clique)
+        steps = 0
+
+        def search(uncolored, used):
+            nonlocal steps
+            if not uncolored:
+                return True
+            steps += 1
+            if budget is not None and steps > budget:
+                return None
+            choice = None
+            for vertex in BitsetGraph.vertices_of(uncolored):
+                colors = [i for i in range(used) if not classes[i] & self.rows[vertex]]
+                if used < number_colors:
+                    colors.append(used)
+                if not colors:
+                    return False
+                if choice is None or len(colors) < len(choice[1]):
+                    choice = vertex, colors
+            vertex, colors = choice
+            for i in colors:
+                classes[i] |= 1 << vertex
+                colorable = search(uncolored & ~(1 << vertex), max(used, i + 1))
+                if colorable is not False:
+                    return colorable
+                classes[i] &= ~(1 << vertex)
+            return False
+
+        return search(uncolored, len(clique))
+
+    def is_chromatic_number_at_most(self, number_colors):
+        # NOTE: decision version for conditions such as χ(G) < k, it stops as soon as a bound settles it
+        clique = self.maximum_clique_vertices()
+        if len(clique) > number_colors:
+            return False
+        if len(self.dsatur()) <= number_colors:
+            return True
+        return self.is_colorable(number_colors, clique)
+
+    def chromatic_number(self):
+        # NOTE: the clique number bounds it from below and DSATUR from above, the gap is closed by testing
+        #  whether the graph is k-colorable from the lower bound up
+        clique = self.maximum_clique_vertices()
+        upper = len(self.dsatur())
+        for number_colors in range(len(clique), upper):
+            if self.is_colorable(number_colors, clique):
+                return number_colors
+        return upper
+
+    def minimum_dominating_set(self, at_most=None):
+        # NOTE: branch and bound on the closed neighbourhoods: the undominated vertex with the fewest closed
+        #  neighbours must be dominated by one of them, each one is tried, those dominating the most first.
+        #  A branch stops when the undominated vertices cannot be covered by fewer vertices than the best set
+        #  found, each vertex covering at most the largest number of them any vertex covers.
+        #  at_most: decision version, the search stops at the first dominating set of at most that many vertices
+        #  and returns None when there is none
+        closed = [row | 1 << vertex for vertex, row in enumerate(self.rows)]
+        best = self.greedy_dominating_set(closed)
+        if at_most is not None and len(best) <= at_most:
+            return [self.nodes[vertex] for vertex in best]
+        bound = len(best) if at_most is None else at_most + 1
+        chosen = []
+
+        def search(undominated):
+            nonlocal best, bound
+            if not undominated:
+                best, bound = chosen[:], len(chosen)
+                return at_most is not None
+            coverage = max(bin(vertices & undominated).count('1') for vertices in closed)
+            if len(chosen) - (-bin(undominated).count('1') // coverage) >= bound:
+                return False
+            vertex = min(BitsetGraph.vertices_of(undominated), key=lambda v: bin(closed[v]).count('1'))
+            for dominating in sorted(BitsetGraph.vertices_of(closed[vertex]),
+                                     key=lambda v: -bin(closed[v] & undominated).count('1')):
+                chosen.append(dominating)
+                if search(undominated & ~closed[dominating]):
+                    return True
+                chosen.pop()
+            return False
+
+        search(self.full)
+        if at_most is not None and len(best) > at_most:
+            return None
+        return [self.nodes[vertex] for vertex in best]
+
+    def greedy_dominating_set(self, closed):
+        dominating_set = []
+        undominated = self.full
+        while undominated:
+            vertex = max(range(len(closed)), key=lambda v: bin(closed[v] & undominated).count('1'))
+            dominating_set.append(vertex)
+            undominated &= ~closed[vertex]
+        return dominating_set
+
+    def is_self_complementary(self):
+        # NOTE: the graph is compared to its complement in stages, each one a necessary condition cheaper than the
+        #  next: the number of edges, the degree sequences, the colors of a refinement run on both graphs at once,
+        #  and last a search of an isomorphism that only maps vertices of the same color
+        number_nodes = len(self.rows)
+        degrees = [bin(row).count('1') for row in self.rows]
+        if 4 * sum(degrees) != 2 * number_nodes * (number_nodes - 1):
+            return False
+        if sorted(degrees) != sorted(number_nodes - 1 - degree for degree in degrees):
+            return False
+        complement = self.complement()
+        colors, complement_colors = BitsetGraph.refine_colors(self, complement)
+        if sorted(colors) != sorted(complement_colors):
+            return False
+        return self.is_isomorphic_to(complement, colors, complement_colors)
+
+    @staticmethod
+    def refine_colors(first, second):
+        # NOTE: color refinement (1-dimensional Weisfeiler-Leman) of both graphs with the same names for the
+        #  colors, so that an isomorphism maps each vertex to a vertex of the same color
+        colors = [[0] * len(first.rows), [0] * len(second.rows)]
+        number_colors = 1
+        while True:
+            names = {}
+            signatures = [[(color[vertex], tuple(sorted(color[neighbour]
+                                                        for neighbour in BitsetGraph.vertices_of(graph.rows[vertex]))))
+                           for vertex in range(len(graph.rows))]
+                          for graph, color in zip((first, second), colors)]
+            for signature in sorted(set(signatures[0]) | set(signatures[1])):
+                names[signature] = len(names)
+            colors = [[names[signature] for signature in signature_graph] for signature_graph in signatures]
+            if len(names) == number_colors:
+                return colors
+            number_colors = len(names)
+
+    def is_isomorphic_to(self, other, colors, other_colors):
+        # NOTE: backtracking over the vertices in order of their color classes, smallest class first; a vertex
+        #  is mapped to an unused vertex of the same color whose adjacencies to the vertices already mapped agree
+        order = sorted(range(len(self.rows)), key=lambda vertex: (colors.count(colors[vertex]), colors[vertex]))
+        image = {}
+
+        def search(position, used):
+            if position == len(order):
+                return True
+            vertex = order[position]
+            for candidate in BitsetGraph.vertices_of(other.full & ~used):
+                if other_colors[candidate] != colors[vertex]:
+                    continue
+                if all((self.rows[vertex] >> mapped & 1) == (other.rows[candidate] >> image[mapped] & 1)
+                       for mapped in order[:position]):
+                    image[vertex] = candidate
+                    if search(position + 1, used | 1 << candidate):
+                        return True
+            return False
+
+        return search(0, 0)
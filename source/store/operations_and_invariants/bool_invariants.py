@@ -4,6 +4,7 @@ import networkx.algorithms.threshold
 import numpy.linalg as la
 
 import source.store.operations_and_invariants.other_invariants as inv_other
+from source.store.operations_and_invariants.bitsets import BitsetGraph
 from source.store.operations_and_invariants.invariants import Invariant
 from source.store.operations_and_invariants.invariants import UtilsToInvariants as Utils
 
@@ -183,7 +184,7 @@ class SelfComplementary(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        return nx.is_isomorphic(graph, nx.complement(graph))
+        return BitsetGraph.of(graph).is_self_complementary()
 
     @staticmethod
     def print(graph, precision):
@@ -274,7 +275,7 @@ class SomeEigenIntegerD(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
+        if inv_other.DistanceMatrix.is_connected(graph):
             return Utils.is_there_integer(inv_other.DistanceSpectrum.calculate(graph))
         else:
             return False
@@ -290,7 +291,7 @@ class SomeEigenIntegerDL(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
+        if inv_other.DistanceMatrix.is_connected(graph):
             return Utils.is_there_integer(inv_other.LaplacianDistanceSpectrum.calculate(graph))
         else:
             return False
@@ -306,7 +307,7 @@ class SomeEigenIntegerDQ(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
+        if inv_other.DistanceMatrix.is_connected(graph):
             return Utils.is_there_integer(inv_other.SignlessLaplacianDistanceSpectrum.calculate(graph))
         else:
             return False
@@ -348,7 +349,7 @@ class SomeEigenIntegerE(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
+        if inv_other.DistanceMatrix.is_connected(graph):
             return Utils.is_there_integer(inv_other.EccentricitySpectrum.calculate(graph))
         else:
             return False
@@ -377,7 +378,8 @@ class IntegralA(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        return Utils.integral(inv_other.AdjacencySpectrum.calculate(graph))
+        return (Utils.may_be_integral(inv_other.AdjacencyMatrix.calculate(graph))
+                and Utils.integral(inv_other.AdjacencySpectrum.calculate(graph)))
 
     @staticmethod
     def print(graph, precision):
@@ -390,7 +392,8 @@ class IntegralL(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        return Utils.integral(inv_other.LaplacianSpectrum.calculate(graph))
+        return (Utils.may_be_integral(inv_other.LaplacianMatrix.calculate(graph))
+                and Utils.integral(inv_other.LaplacianSpectrum.calculate(graph)))
 
     @staticmethod
     def print(graph, precision):
@@ -403,7 +406,8 @@ class IntegralQ(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        return Utils.integral(inv_other.SignlessLaplacianSpectrum.calculate(graph))
+        return (Utils.may_be_integral(inv_other.SignlessLaplacianMatrix.calculate(graph))
+                and Utils.integral(inv_other.SignlessLaplacianSpectrum.calculate(graph)))
 
     @staticmethod
     def print(graph, precision):
@@ -432,7 +436,8 @@ class IntegralS(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        return Utils.integral(inv_other.SeidelSpectrum.calculate(graph))
+        return (Utils.may_be_integral(inv_other.SeidelMatrix.calculate(graph))
+                and Utils.integral(inv_other.SeidelSpectrum.calculate(graph)))
 
     @staticmethod
     def print(graph, precision):
@@ -445,8 +450,9 @@ class IntegralD(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.integral(inv_other.DistanceSpectrum.calculate(graph))
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return (Utils.may_be_integral(inv_other.DistanceMatrix.calculate(graph))
+                    and Utils.integral(inv_other.DistanceSpectrum.calculate(graph)))
         else:
             return False
 
@@ -461,8 +467,9 @@ class IntegralDL(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.integral(inv_other.LaplacianDistanceSpectrum.calculate(graph))
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return (Utils.may_be_integral(inv_other.LaplacianDistanceMatrix.calculate(graph))
+                    and Utils.integral(inv_other.LaplacianDistanceSpectrum.calculate(graph)))
         else:
             return False
 
@@ -477,8 +484,9 @@ class IntegralDQ(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.integral(inv_other.SignlessLaplacianDistanceSpectrum.calculate(graph))
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return (Utils.may_be_integral(inv_other.SignlessLaplacianDistanceMatrix.calculate(graph))
+                    and Utils.integral(inv_other.SignlessLaplacianDistanceSpectrum.calculate(graph)))
         else:
             return False
 
@@ -493,8 +501,9 @@ class IntegralE(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.integral(inv_other.EccentricitySpectrum.calculate(graph))
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return (Utils.may_be_integral(inv_other.EccentricityMatrix.calculate(graph))
+                    and Utils.integral(inv_other.EccentricitySpectrum.calculate(graph)))
         else:
             return False
 
@@ -561,7 +570,7 @@ class LargestEigenIntegerD(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
+        if inv_other.DistanceMatrix.is_connected(graph):
             return Utils.is_integer(inv_other.DistanceSpectrum.calculate(graph)[nx.number_of_nodes(graph) - 1])
         else:
             return False
@@ -577,7 +586,7 @@ class LargestEigenIntegerDL(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
+        if inv_other.DistanceMatrix.is_connected(graph):
             return Utils.is_integer(inv_other.LaplacianDistanceSpectrum.calculate(graph)[nx.number_of_nodes(graph) - 1])
         else:
             return False
@@ -593,7 +602,7 @@ class LargestEigenIntegerDQ(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
+        if inv_other.DistanceMatrix.is_connected(graph):
             return Utils.is_integer(
                 inv_other.SignlessLaplacianDistanceSpectrum.calculate(graph)[nx.number_of_nodes(graph) - 1])
         else:
@@ -636,7 +645,7 @@ class LargestEigenIntegerE(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
+        if inv_other.DistanceMatrix.is_connected(graph):
             return Utils.is_integer(inv_other.EccentricitySpectrum.calculate(graph)[nx.number_of_nodes(graph) - 1])
         return False
 
@@ -664,8 +673,8 @@ class RegularTransmission(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            dist_matrix = nx.algorithms.shortest_paths.floyd_warshall_numpy(graph)
+        if inv_other.DistanceMatrix.is_connected(graph):
+            dist_matrix = inv_other.DistanceMatrix.calculate(graph)
             transmission = [sum(dist_matrix[:, i]) for i in range(0, dist_matrix.shape[0])]
             return bool(max(transmission) == min(transmission))
         else:
@@ -682,7 +691,7 @@ class InvertibleMatrixA(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        return bool(Utils.approx_to_int(la.det(inv_other.AdjacencyMatrix.calculate(graph))) != 0)
+        return Utils.exact_rank_determinant(graph, inv_other.AdjacencyMatrix.calculate)[1] != 0
 
     @staticmethod
     def print(graph, precision):
@@ -695,7 +704,7 @@ class InvertibleMatrixL(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        return bool(Utils.approx_to_int(la.det(inv_other.LaplacianMatrix.calculate(graph))) != 0)
+        return Utils.exact_rank_determinant(graph, inv_other.LaplacianMatrix.calculate)[1] != 0
 
     @staticmethod
     def print(graph, precision):
@@ -708,7 +717,7 @@ class InvertibleMatrixQ(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        return bool(Utils.approx_to_int(la.det(inv_other.SignlessLaplacianMatrix.calculate(graph))) != 0)
+        return Utils.exact_rank_determinant(graph, inv_other.SignlessLaplacianMatrix.calculate)[1] != 0
 
     @staticmethod
     def print(graph, precision):
@@ -721,8 +730,8 @@ class InvertibleMatrixD(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return bool(Utils.approx_to_int(la.det(inv_other.DistanceMatrix.calculate(graph))) != 0)
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.exact_rank_determinant(graph, inv_other.DistanceMatrix.calculate)[1] != 0
         else:
             return False
 
@@ -737,8 +746,8 @@ class InvertibleMatrixDL(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return bool(Utils.approx_to_int(la.det(inv_other.LaplacianDistanceMatrix.calculate(graph))) != 0)
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.exact_rank_determinant(graph, inv_other.LaplacianDistanceMatrix.calculate)[1] != 0
         else:
             return False
 
@@ -753,8 +762,8 @@ class InvertibleMatrixDQ(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return bool(Utils.approx_to_int(la.det(inv_other.SignlessLaplacianDistanceMatrix.calculate(graph))) != 0)
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.exact_rank_determinant(graph, inv_other.SignlessLaplacianDistanceMatrix.calculate)[1] != 0
         else:
             return False
 
@@ -782,7 +791,7 @@ class InvertibleMatrixS(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        return bool(Utils.approx_to_int(la.det(inv_other.SeidelMatrix.calculate(graph))) != 0)
+        return Utils.exact_rank_determinant(graph, inv_other.SeidelMatrix.calculate)[1] != 0
 
     @staticmethod
     def print(graph, precision):
@@ -795,7 +804,7 @@ class InvertibleMatrixE(InvariantBool):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
+        if inv_other.DistanceMatrix.is_connected(graph):
             return bool(Utils.approx_to_int(la.det(inv_other.EccentricityMatrix.calculate(graph))) != 0)
         return False
 
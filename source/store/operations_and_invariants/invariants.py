@@ -1,3 +1,7 @@
+import collections
+import functools
+import threading
+
 import numpy as np
 import numpy.linalg as la
 
@@ -17,7 +21,68 @@ class Invariant:
         pass
 
 
+class GraphContext:
+    """Memoizes derived artifacts (matrices, spectra, derived graphs) and invariant values of the graphs
+    evaluated inside a ``with GraphContext():`` block. Outside a block nothing is cached, so graphs edited
+    in the project window are never served stale values.
+
+    A context can be opened on a batch of graphs evaluated one after the other: once a matrix family is requested
+    by at least half of the graphs examined so far, it is decomposed at once for the rest of the batch of the same
+    order, in a single stacked call.
+    """
+    local = threading.local()
+
+    def __init__(self, batch=(), min_requests=4):
+        self.graphs = {}
+        self.values = {}
+        self.previous = None
+        self.batch = {id(graph): graph for graph in batch}
+        self.min_requests = min_requests
+        self.examined = 0
+        self.requests = collections.Counter()
+
+    def __enter__(self):
+        self.previous = GraphContext.current()
+        GraphContext.local.current = self
+        return self
+
+    def __exit__(self, *args):
+        GraphContext.local.current = self.previous
+
+    @staticmethod
+    def current():
+        return getattr(GraphContext.local, 'current', None)
+
+    @staticmethod
+    def get(graph, key, function):
+        context = GraphContext.current()
+        if context is None:
+            return function(graph)
+        index = (id(graph), key)
+        if index not in context.values:
+            # NOTE: keeping the graph alive prevents its id from being reused by another graph of the context
+            context.graphs[id(graph)] = graph
+            value = function(graph)
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+            context.values[index] = value
+        return context.values[index]
+
+    @staticmethod
+    def cached(function):
+        key = function.__qualname__
+
+        @functools.wraps(function)
+        def calculate(graph):
+            return GraphContext.get(graph, key, function)
+
+        return calculate
+
+
 class UtilsToInvariants:
+    # NOTE: primes below 2^31, the product of two residues and the difference of two such products fit in int64
+    elimination_primes = (2147483647, 2147483629, 2147483587, 2147483579, 2147483563, 2147483549, 2147483543,
+                          2147483497, 2147483489, 2147483477)
 
     @staticmethod
     def approx_to_int(number, error=10 ** -8):
@@ -27,21 +92,17 @@ class UtilsToInvariants:
             return round(number, ndigits=5)
 
     @staticmethod
-    def approx_array_to_int(array):
-        if isinstance(array, list):
-            for index, x in enumerate(array):
-                array[index] = UtilsToInvariants.approx_to_int(x)
-        if isinstance(array, np.ndarray):
-            for index, x in np.ndenumerate(array):
-                array[index] = UtilsToInvariants.approx_to_int(x)
-        return np.around(array, decimals=5)
+    def approx_array_to_int(array, error=10 ** -8):
+        # NOTE: the same snapping as approx_to_int, on every element of the array at once; adding 0.0 turns the
+        #  -0.0 left by a small negative value into 0.0
+        array = np.asarray(array, dtype=float)
+        nearest = np.round(array)
+        return np.around(np.where(np.abs(nearest - array) <= error, nearest, array), decimals=5) + 0.0
 
     @staticmethod
     def is_there_integer(group):
-        for number in group:
-            if UtilsToInvariants.approx_to_int(number).is_integer():
-                return True
-        return False
+        group = UtilsToInvariants.approx_array_to_int(group)
+        return bool(np.any(group == np.round(group)))
 
     @staticmethod
     def is_integer(number):
@@ -49,8 +110,27 @@ class UtilsToInvariants:
 
     @staticmethod
     def integral(group):
-        for number in group:
-            if not UtilsToInvariants.approx_to_int(number).is_integer():
+        group = UtilsToInvariants.approx_array_to_int(group)
+        return bool(np.all(group == np.round(group)))
+
+    @staticmethod
+    def may_be_integral(matrix, primes=(2, 3, 5)):
+        # NOTE: exact pre-rejection of integral spectra without eigenvalues. When every eigenvalue of an integer
+        #  matrix M is an integer, its characteristic polynomial splits into linear factors modulo every prime q,
+        #  so M^q - M, whose eigenvalues are the λ^q - λ, is nilpotent modulo q. The powers are taken by squaring,
+        #  the entries stay below q, so the float products are exact
+        m = np.asarray(matrix, dtype=float)
+        squarings = max(1, (m.shape[0] - 1).bit_length())
+        for q in primes:
+            power = m
+            for _ in range(q - 1):
+                power = np.mod(power @ m, q)
+            nilpotent = np.mod(power - m, q)
+            for _ in range(squarings):
+                if not nilpotent.any():
+                    break
+                nilpotent = np.mod(nilpotent @ nilpotent, q)
+            if nilpotent.any():
                 return False
         return True
 
@@ -116,40 +196,257 @@ class UtilsToInvariants:
         return len(max(list_text, key=len))
 
     @staticmethod
-    def main_eigenvalue(matrix: np.ndarray):
-        eigenvalues, vectors = la.eigh(matrix)
-        eigenvalues = np.around(eigenvalues, decimals=10)
-        vectors = np.around(vectors, decimals=10)
-        one = np.ones(matrix.shape[0])
-        mains = set()
-        for i, value in enumerate(eigenvalues):
-            if UtilsToInvariants.approx_to_int(np.dot(one, vectors[:, i])) != 0:
-                mains.add(value)
-        return mains
+    def eigenvalues(graph, matrix_function):
+        # NOTE: the eigenvalues of a matrix family are computed once per graph of a GraphContext, every spectrum
+        #  of the family is served from them
+        def eigenvalues_of(g):
+            eigenvalues = la.eigvalsh(matrix_function(g))
+            eigenvalues.flags.writeable = False
+            return eigenvalues
+
+        key = ('eigenvalues', matrix_function.__qualname__)
+        context = GraphContext.current()
+        if context is not None and id(graph) in context.batch and (id(graph), key) not in context.values:
+            context.requests[key] += 1
+            if context.requests[key] >= max(context.min_requests, context.examined / 2):
+                UtilsToInvariants.batch_eigenvalues(context, graph, key, matrix_function)
+        return GraphContext.get(graph, key, eigenvalues_of)
+
+    @staticmethod
+    def batch_eigenvalues(context, graph, key, matrix_function):
+        # NOTE: the matrices of the graphs of the same order still to be computed are stacked in a (k, n, n)
+        #  array, one call to la.eigvalsh computes them all without the overhead of a call per small matrix
+        siblings, matrices = UtilsToInvariants.batch_siblings(context, graph, key, matrix_function)
+        if not siblings:
+            return
+        eigenvalues = la.eigvalsh(np.stack(matrices))
+        eigenvalues.flags.writeable = False
+        for index, sibling in enumerate(siblings):
+            context.graphs[id(sibling)] = sibling
+            context.values[(id(sibling), key)] = eigenvalues[index]
+
+    @staticmethod
+    def eigendecomposition(graph, matrix_function):
+        # NOTE: the eigenvectors are only needed by the main eigenvalues and the eigenvectors invariants, they are
+        #  computed graph by graph when asked for and shared by the invariants of the family
+        def decompose(g):
+            eigenvalues, vectors = la.eigh(matrix_function(g))
+            eigenvalues.flags.writeable = False
+            vectors.flags.writeable = False
+            return eigenvalues, vectors
+
+        return GraphContext.get(graph, ('eigendecomposition', matrix_function.__qualname__), decompose)
+
+    @staticmethod
+    def batch_siblings(context, graph, key, matrix_function):
+        # NOTE: the graphs of the batch of the same order as the graph whose value for the key is not known yet,
+        #  with their matrices
+        order = graph.number_of_nodes()
+        siblings = []
+        matrices = []
+        for sibling in context.batch.values():
+            if sibling.number_of_nodes() != order or (id(sibling), key) in context.values:
+                continue
+            try:
+                matrix = matrix_function(sibling)
+            except Exception:
+                continue
+            # NOTE: a sibling without this matrix (disconnected for the distance families: inf distances, or the
+            #  'Disconnected graph' message of the eccentricity matrix) is left out
+            if isinstance(matrix, np.ndarray) and np.isfinite(matrix).all():
+                siblings.append(sibling)
+                matrices.append(matrix)
+        return siblings, matrices
+
+    @staticmethod
+    def main_eigenvalue(decomposition):
+        # NOTE: an eigenvalue is main when one of its eigenvectors is not orthogonal to the all-ones vector,
+        #  the products of the all-ones vector with all the eigenvectors are the column sums of their matrix
+        eigenvalues = np.around(decomposition[0], decimals=10)
+        vectors = np.around(decomposition[1], decimals=10)
+        projections = np.ones(vectors.shape[0]) @ vectors
+        return set(eigenvalues[UtilsToInvariants.approx_array_to_int(projections) != 0])
+
+    @staticmethod
+    def spectrum(eigenvalues):
+        return UtilsToInvariants.approx_array_to_int(eigenvalues)
+
+    @staticmethod
+    def largest_eigen(spectrum):
+        return spectrum[len(spectrum) - 1]
+
+    @staticmethod
+    def second_largest_eigen(spectrum):
+        return spectrum[len(spectrum) - 2]
+
+    @staticmethod
+    def smallest_eigen(spectrum):
+        return spectrum[0]
+
+    @staticmethod
+    def eigenvectors(decomposition):
+        return decomposition[0], UtilsToInvariants.approx_array_to_int(decomposition[1])
+
+    @staticmethod
+    def exact_determinant(matrix):
+        return UtilsToInvariants.exact_elimination(matrix)[1]
+
+    @staticmethod
+    def exact_elimination(matrix):
+        return UtilsToInvariants.exact_eliminations(np.asarray(matrix, dtype=float)[None])[0]
+
+    @staticmethod
+    def exact_eliminations(matrices):
+        # NOTE: the ranks and the determinants of a (k, rows, columns) stack of integer matrices, exact. They are
+        #  eliminated modulo a few primes at once; every minor is bounded by the product of the norms of the rows
+        #  (Hadamard), so with primes whose product exceeds twice that bound, a nonzero minor is not divisible by
+        #  all of them: the rank is the largest rank modulo the primes and the determinant is recovered by the
+        #  Chinese remainder theorem. Bareiss eliminates the stacks whose bound needs more primes than there are
+        a = np.rint(matrices)
+        norms = np.maximum(np.sqrt((a * a).sum(axis=2)), 1.0)
+        number_primes = max(1, int(np.ceil((float(np.log2(norms).sum(axis=1).max(initial=0)) + 2) / 30.99)))
+        if number_primes > len(UtilsToInvariants.elimination_primes):
+            return [UtilsToInvariants.bareiss_elimination(matrix) for matrix in a]
+        primes = UtilsToInvariants.elimination_primes[:number_primes]
+        if len(a) == 1:
+            ranks, residues = zip(*[UtilsToInvariants.modular_elimination_rows(a[0], prime) for prime in primes])
+        else:
+            ranks, residues = UtilsToInvariants.modular_elimination(np.repeat(a.astype(np.int64), len(primes), axis=0),
+                                                                    primes * len(a))
+        eliminations = []
+        for index in range(len(a)):
+            modulus = 1
+            determinant = 0
+            for layer, prime in enumerate(primes, start=index * len(primes)):
+                # NOTE: determinant ≡ residue (mod prime), solved among the multiples of the modulus added to it
+                determinant += modulus * ((residues[layer] - determinant) * pow(modulus, -1, prime) % prime)
+                modulus *= prime
+            if determinant > modulus // 2:
+                determinant -= modulus
+            eliminations.append((max(ranks[index * len(primes):(index + 1) * len(primes)]), determinant))
+        return eliminations
 
     @staticmethod
-    def spectrum(matrix: np.ndarray):
-        return UtilsToInvariants.approx_array_to_int(la.eigvalsh(matrix).tolist())
+    def modular_elimination(matrices, primes):
+        # NOTE: Gaussian elimination on int64 of a stack of matrices, each one modulo its prime, below 2^31 so a
+        #  product of two residues fits. Each NumPy operation covers a column of the whole stack. In each column
+        #  the first row not used yet with a nonzero entry is the pivot, every other row r not used yet becomes
+        #  pivot * r - r[column] * pivot row: the rows are not swapped and no inverse is needed, but each pivot
+        #  multiplies the determinant by itself once per row below it, divided out at the end
+        p = np.array(primes, dtype=np.int64)
+        a = np.mod(matrices, p[:, None, None])
+        layers = np.arange(a.shape[0])
+        unused = np.ones(a.shape[:2], dtype=bool)
+        pivot_rows = []
+        # NOTE: product of the pivots, and product over the columns but the last of that running product, that
+        #  is the scaling of the determinant when every column has a pivot
+        product = np.ones(a.shape[0], dtype=np.int64)
+        scaling = np.ones(a.shape[0], dtype=np.int64)
+        for column in range(a.shape[2]):
+            entries = a[:, :, column]
+            candidates = (entries != 0) & unused
+            row = candidates.argmax(axis=1)
+            found = candidates[layers, row]
+            unused[layers, row] &= ~found
+            below = unused & found[:, None]
+            pivot = np.where(found, entries[layers, row], 1)
+            a = np.mod(np.where(below, pivot[:, None], 1)[:, :, None] * a
+                       - (entries * below)[:, :, None] * a[layers, row][:, None, :], p[:, None, None])
+            pivot_rows.append(row)
+            product = product * pivot % p
+            if column < a.shape[2] - 1:
+                scaling = scaling * product % p
+        ranks = a.shape[1] - unused.sum(axis=1)
+        if a.shape[1] != a.shape[2]:
+            return ranks.tolist(), [0] * a.shape[0]
+        # NOTE: the pivot rows taken column after column are a permutation, its parity is the sign
+        pivot_rows = np.stack(pivot_rows, axis=1)
+        inversions = np.triu(pivot_rows[:, :, None] > pivot_rows[:, None, :]).sum(axis=(1, 2))
+        residues = []
+        for layer, prime in enumerate(primes):
+            if ranks[layer] < a.shape[1]:
+                residues.append(0)
+                continue
+            residue = int(product[layer]) * pow(int(scaling[layer]), -1, prime) % prime
+            residues.append(-residue % prime if inversions[layer] % 2 else residue)
+        return ranks.tolist(), residues
 
     @staticmethod
-    def largest_eigen(matrix: np.ndarray):
-        return UtilsToInvariants.approx_array_to_int(la.eigvalsh(matrix).tolist())[matrix.shape[0] - 1]
+    def modular_elimination_rows(matrix, prime):
+        # NOTE: the elimination of a single matrix modulo a prime, on lists of Python integers: for one small
+        #  matrix the cost of a NumPy call per column exceeds that of its arithmetic
+        a = [[int(entry) % prime for entry in row] for row in matrix.tolist()]
+        rows, columns = len(a), len(a[0]) if a else 0
+        rank = 0
+        determinant = 1
+        for column in range(columns):
+            if rank == rows:
+                break
+            pivot_row = next((row for row in range(rank, rows) if a[row][column]), None)
+            if pivot_row is None:
+                continue
+            if pivot_row != rank:
+                a[rank], a[pivot_row] = a[pivot_row], a[rank]
+                determinant = -determinant
+            pivot = a[rank][column]
+            determinant = determinant * pivot % prime
+            inverse = pow(pivot, -1, prime)
+            for row in range(rank + 1, rows):
+                factor = a[row][column] * inverse % prime
+                if factor:
+                    a[row][column:] = [(x - factor * y) % prime for x, y in zip(a[row][column:], a[rank][column:])]
+            rank += 1
+        return rank, determinant % prime if rank == rows == columns else 0
 
     @staticmethod
-    def second_largest_eigen(matrix: np.ndarray):
-        return UtilsToInvariants.approx_array_to_int(la.eigvalsh(matrix).tolist())[matrix.shape[0] - 2]
+    def bareiss_elimination(matrix):
+        # NOTE: fraction-free elimination of Bareiss on Python integers, every division is exact, so the rank and
+        #  the determinant of an integer matrix come out exact from one pass whatever its size; the rows are
+        #  updated as NumPy object arrays. A column without a pivot is skipped, it does not add to the rank
+        a = np.rint(matrix).astype(np.int64).astype(object)
+        rows, columns = a.shape
+        rank = 0
+        sign = 1
+        previous = 1
+        for column in range(columns):
+            if rank == rows:
+                break
+            pivots = np.flatnonzero(a[rank:, column] != 0)
+            if len(pivots) == 0:
+                continue
+            if pivots[0] != 0:
+                a[[rank, rank + pivots[0]]] = a[[rank + pivots[0], rank]]
+                sign = -sign
+            a[rank + 1:, column + 1:] = (a[rank + 1:, column + 1:] * a[rank, column]
+                                         - np.outer(a[rank + 1:, column], a[rank, column + 1:])) // previous
+            a[rank + 1:, column] = 0
+            previous = a[rank, column]
+            rank += 1
+        determinant = sign * int(previous) if rank == rows == columns else 0
+        return rank, determinant
 
     @staticmethod
-    def smallest_eigen(matrix: np.ndarray):
-        return UtilsToInvariants.approx_array_to_int(la.eigvalsh(matrix).tolist())[0]
+    def exact_rank_determinant(graph, matrix_function):
+        # NOTE: the rank, nullity, invertibility and determinant of an integer matrix family share one elimination,
+        #  batched like the eigenvalues for the graphs of a GraphContext
+        key = ('exact_elimination', matrix_function.__qualname__)
+        context = GraphContext.current()
+        if context is not None and id(graph) in context.batch and (id(graph), key) not in context.values:
+            context.requests[key] += 1
+            if context.requests[key] >= max(context.min_requests, context.examined / 2):
+                UtilsToInvariants.batch_exact_elimination(context, graph, key, matrix_function)
+        return GraphContext.get(graph, key, lambda g: UtilsToInvariants.exact_elimination(matrix_function(g)))
 
     @staticmethod
-    def eigenvectors(matrix: np.ndarray):
-        values, vectors = la.eigh(matrix)
-        return values, UtilsToInvariants.approx_array_to_int(vectors)
+    def batch_exact_elimination(context, graph, key, matrix_function):
+        siblings, matrices = UtilsToInvariants.batch_siblings(context, graph, key, matrix_function)
+        if not siblings:
+            return
+        for sibling, elimination in zip(siblings, UtilsToInvariants.exact_eliminations(np.stack(matrices))):
+            context.graphs[id(sibling)] = sibling
+            context.values[(id(sibling), key)] = elimination
 
     @staticmethod
-    def energy(matrix: np.ndarray):
+    def energy(matrix: np.ndarray, spectrum):
         trace = matrix.trace()
-        eig = UtilsToInvariants.spectrum(matrix)
-        return sum([np.absolute(x - (float(trace) / float(matrix.shape[0]))) for x in eig])
+        return sum([np.absolute(x - (float(trace) / float(matrix.shape[0]))) for x in spectrum])
@@ -1,10 +1,14 @@
+import collections
+
 import grinpy as gp
 import networkx as nx
-import numpy as np
 import numpy.linalg as la
+import pulp
 
+import source.store.operations_and_invariants.operations as oper
 import source.store.operations_and_invariants.other_invariants as inv_other
-from source.store.operations_and_invariants.invariants import Invariant
+from source.store.operations_and_invariants.bitsets import BitsetGraph
+from source.store.operations_and_invariants.invariants import GraphContext, Invariant
 from source.store.operations_and_invariants.invariants import UtilsToInvariants as Utils
 
 
@@ -22,7 +26,7 @@ class InvariantNum(Invariant):
         for i, inv in enumerate(self.all):
             inv.is_a_function = True
             inv.code_literal = 'F' + str(i)
-            self.dic_function[inv.code_literal] = inv.calculate
+            self.dic_function[inv.code_literal] = GraphContext.cached(inv.calculate)
             if inv.type == 'number_structural':
                 self.dic_name_inv_structural[inv.name] = inv
             elif inv.type == 'number_spectral':
@@ -69,11 +73,19 @@ class CliqueNumber(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return len(set(nx.max_weight_clique(graph, weight=None)[0]))
+        return len(BitsetGraph.of(graph).maximum_clique())
+
+    @staticmethod
+    def is_at_least(graph, size):
+        return BitsetGraph.of(graph).has_clique(size)
+
+    @staticmethod
+    def is_at_most(graph, size):
+        return not BitsetGraph.of(graph).has_clique(size + 1)
 
     @staticmethod
     def print(graph, precision):
-        return Utils.print_set(set(nx.max_weight_clique(graph, weight=None)[0]), precision)
+        return Utils.print_set(set(BitsetGraph.of(graph).maximum_clique()), precision)
 
 
 class IndependenceNumber(InvariantNum):
@@ -83,52 +95,82 @@ class IndependenceNumber(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return CliqueNumber.calculate(nx.complement(graph))
+        return len(BitsetGraph.of(graph).maximum_independent_set())
+
+    @staticmethod
+    def is_at_least(graph, size):
+        return BitsetGraph.of(graph).has_independent_set(size)
+
+    @staticmethod
+    def is_at_most(graph, size):
+        return not BitsetGraph.of(graph).has_independent_set(size + 1)
 
     @staticmethod
     def print(graph, precision):
-        return CliqueNumber.print(nx.complement(graph), precision)
+        return Utils.print_set(set(BitsetGraph.of(graph).maximum_independent_set()), precision)
 
 
 class DominationNumber(InvariantNum):
     name = "Domination number"
     code = '\u0194'
     type = "number_structural"
+    # NOTE: from this order on, the integer program solved by CBC is faster than the branch and bound on bitsets
+    ilp_order = 36
 
     @staticmethod
     def calculate(graph):
-        return gp.domination_number(graph)
+        return len(DominationNumber.minimum_dominating_set(graph))
+
+    @staticmethod
+    @GraphContext.cached
+    def minimum_dominating_set(graph):
+        if graph.number_of_nodes() >= DominationNumber.ilp_order:
+            return DominationNumber.minimum_dominating_set_ilp(graph)
+        return BitsetGraph.of(graph).minimum_dominating_set()
+
+    @staticmethod
+    def minimum_dominating_set_ilp(graph):
+        # NOTE: minimize the number of chosen vertices, every closed neighbourhood holding at least one of them
+        problem = pulp.LpProblem('domination', pulp.LpMinimize)
+        chosen = {node: pulp.LpVariable(f'x{i}', cat=pulp.LpBinary) for i, node in enumerate(graph)}
+        problem += pulp.lpSum(chosen.values())
+        for node in graph:
+            problem += chosen[node] + pulp.lpSum(chosen[neighbour] for neighbour in graph[node]) >= 1
+        problem.solve(pulp.PULP_CBC_CMD(msg=False))
+        return [node for node in graph if chosen[node].value() > 0.5]
+
+    @staticmethod
+    def is_at_most(graph, size):
+        if graph.number_of_nodes() >= DominationNumber.ilp_order:
+            return DominationNumber.calculate(graph) <= size
+        return BitsetGraph.of(graph).minimum_dominating_set(at_most=size) is not None
+
+    @staticmethod
+    def is_at_least(graph, size):
+        return not DominationNumber.is_at_most(graph, size - 1)
 
     @staticmethod
     def print(graph, precision):
-        return Utils.print_numeric(gp.domination_number(graph), precision)
+        return Utils.print_numeric(DominationNumber.calculate(graph), precision)
 
 
 class ChromaticNumber(InvariantNum):
-    name = "Chromatic number (estimated)"
+    name = "Chromatic number"
     code = '\u03c7'
     type = "number_structural"
 
     @staticmethod
+    @GraphContext.cached
     def calculate(graph):
-        n = len(graph.nodes())
-        m = len(graph.edges())
-        if m == 0:
-            return 1
-        if m == n * (n - 1) / 2:
-            return n
-        if m == (n * (n - 1) / 2) - 1:
-            return n - 1
-        if nx.is_bipartite(graph):
-            return 2
+        return BitsetGraph.of(graph).chromatic_number()
 
-        strategies = [max(nx.greedy_color(graph, strategy='DSATUR').values()),
-                      max(nx.greedy_color(graph, strategy='largest_first', interchange=True).values()),
-                      max(nx.greedy_color(graph, strategy='smallest_last', interchange=True).values()),
-                      max(nx.greedy_color(graph, strategy='random_sequential', interchange=True).values())
-                      ]
+    @staticmethod
+    def is_at_most(graph, number_colors):
+        return BitsetGraph.of(graph).is_chromatic_number_at_most(number_colors)
 
-        return round(min(strategies) + 1)
+    @staticmethod
+    def is_at_least(graph, number_colors):
+        return not ChromaticNumber.is_at_most(graph, number_colors - 1)
 
     @staticmethod
     def print(graph, precision):
@@ -142,10 +184,36 @@ class GirthNumber(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return len(nx.minimum_cycle_basis(graph))
-        else:
+        # NOTE: a forest has no cycle, its girth is infinite
+        if graph.number_of_edges() + nx.number_connected_components(graph) == graph.number_of_nodes():
             return 10 ** 10
+        girth = 10 ** 10
+        for source in graph:
+            girth = min(girth, GirthNumber.shortest_cycle_through(graph, source, girth))
+            if girth == 3:
+                break
+        return girth
+
+    @staticmethod
+    def shortest_cycle_through(graph, source, girth):
+        # NOTE: breadth-first search from source, an edge to a visited vertex other than the parent closes a
+        #  cycle of length at most dist[u] + dist[w] + 1, and the shortest cycle through source is found this way.
+        #  The search stops once the vertices are too far from source to close a cycle shorter than girth
+        dist = {source: 0}
+        parent = {source: None}
+        queue = collections.deque([source])
+        while queue:
+            u = queue.popleft()
+            if 2 * dist[u] >= girth:
+                break
+            for w in graph[u]:
+                if w not in dist:
+                    dist[w] = dist[u] + 1
+                    parent[w] = u
+                    queue.append(w)
+                elif w != parent[u]:
+                    girth = min(girth, dist[u] + dist[w] + 1)
+        return girth
 
     @staticmethod
     def print(graph, precision):
@@ -159,11 +227,17 @@ class MatchingNumber(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return IndependenceNumber.calculate(nx.line_graph(graph))
+        return len(MatchingNumber.maximum_matching(graph))
+
+    @staticmethod
+    @GraphContext.cached
+    def maximum_matching(graph):
+        # NOTE: blossom algorithm on the graph itself, every edge weighs 1 so the matching has maximum cardinality
+        return frozenset(nx.max_weight_matching(graph, maxcardinality=True, weight=None))
 
     @staticmethod
     def print(graph, precision):
-        return IndependenceNumber.print(nx.line_graph(graph), precision)
+        return Utils.print_set(set(MatchingNumber.maximum_matching(graph)), precision)
 
 
 class NumberComponnents(InvariantNum):
@@ -249,7 +323,16 @@ class VertexCover(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return gp.vertex_cover_number(graph)
+        # NOTE: the vertices outside a maximum independent set form a minimum vertex cover
+        return graph.number_of_nodes() - IndependenceNumber.calculate(graph)
+
+    @staticmethod
+    def is_at_least(graph, size):
+        return not IndependenceNumber.is_at_least(graph, graph.number_of_nodes() - size + 1)
+
+    @staticmethod
+    def is_at_most(graph, size):
+        return IndependenceNumber.is_at_least(graph, graph.number_of_nodes() - size)
 
     @staticmethod
     def print(graph, precision):
@@ -263,8 +346,9 @@ class Diameter(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return nx.diameter(graph)
+        eccentricities = inv_other.DistanceMatrix.eccentricities(graph)
+        if eccentricities is not None:
+            return int(eccentricities.max())
         else:
             return 10 ** 10
 
@@ -280,8 +364,9 @@ class Radius(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return nx.radius(graph)
+        eccentricities = inv_other.DistanceMatrix.eccentricities(graph)
+        if eccentricities is not None:
+            return int(eccentricities.min())
         else:
             return 10 ** 10
 
@@ -297,7 +382,7 @@ class Largest1EigenA(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return Utils.largest_eigen(inv_other.AdjacencyMatrix.calculate(graph))
+        return Utils.largest_eigen(inv_other.AdjacencySpectrum.calculate(graph))
 
     @staticmethod
     def print(graph, precision):
@@ -311,7 +396,7 @@ class Largest1EigenL(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return Utils.largest_eigen(inv_other.LaplacianMatrix.calculate(graph))
+        return Utils.largest_eigen(inv_other.LaplacianSpectrum.calculate(graph))
 
     @staticmethod
     def print(graph, precision):
@@ -325,7 +410,7 @@ class Largest1EigenQ(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return Utils.largest_eigen(inv_other.SignlessLaplacianMatrix.calculate(graph))
+        return Utils.largest_eigen(inv_other.SignlessLaplacianSpectrum.calculate(graph))
 
     @staticmethod
     def print(graph, precision):
@@ -339,8 +424,8 @@ class Largest1EigenD(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.largest_eigen(inv_other.DistanceMatrix.calculate(graph))
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.largest_eigen(inv_other.DistanceSpectrum.calculate(graph))
         else:
             return 10 ** 10
 
@@ -356,8 +441,8 @@ class Largest1EigenDL(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.largest_eigen(inv_other.LaplacianDistanceMatrix.calculate(graph))
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.largest_eigen(inv_other.LaplacianDistanceSpectrum.calculate(graph))
         else:
             return 10 ** 10
 
@@ -373,8 +458,8 @@ class Largest1EigenDQ(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.largest_eigen(inv_other.SignlessLaplacianMatrix.calculate(graph))
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.largest_eigen(inv_other.SignlessLaplacianSpectrum.calculate(graph))
         else:
             return 10 ** 10
 
@@ -390,7 +475,7 @@ class Largest1EigenN(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return Utils.largest_eigen(inv_other.NormalizedLaplacianMatrix.calculate(graph))
+        return Utils.largest_eigen(inv_other.NormalizedLaplacianSpectrum.calculate(graph))
 
     @staticmethod
     def print(graph, precision):
@@ -404,7 +489,7 @@ class Largest1EigenS(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return Utils.largest_eigen(inv_other.SeidelMatrix.calculate(graph))
+        return Utils.largest_eigen(inv_other.SeidelSpectrum.calculate(graph))
 
     @staticmethod
     def print(graph, precision):
@@ -418,8 +503,8 @@ class Largest1EigenE(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.largest_eigen(inv_other.EccentricityMatrix.calculate(graph))
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.largest_eigen(inv_other.EccentricitySpectrum.calculate(graph))
         else:
             return 10 ** 10
 
@@ -435,7 +520,7 @@ class Largest1EigenR(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return Utils.largest_eigen(inv_other.RandicMatrix.calculate(graph))
+        return Utils.largest_eigen(inv_other.RandicSpectrum.calculate(graph))
 
     @staticmethod
     def print(graph, precision):
@@ -450,7 +535,7 @@ class Largest2EigenA(InvariantNum):
     @staticmethod
     def calculate(graph):
         if nx.number_of_nodes(graph) > 1:
-            return Utils.largest_eigen(inv_other.AdjacencyMatrix.calculate(graph))
+            return Utils.largest_eigen(inv_other.AdjacencySpectrum.calculate(graph))
         else:
             return 0
 
@@ -467,7 +552,7 @@ class Largest2EigenL(InvariantNum):
     @staticmethod
     def calculate(graph):
         if nx.number_of_nodes(graph) > 1:
-            return Utils.second_largest_eigen(inv_other.LaplacianMatrix.calculate(graph))
+            return Utils.second_largest_eigen(inv_other.LaplacianSpectrum.calculate(graph))
         else:
             return 0
 
@@ -484,7 +569,7 @@ class Largest2EigenQ(InvariantNum):
     @staticmethod
     def calculate(graph):
         if nx.number_of_nodes(graph) > 1:
-            return Utils.second_largest_eigen(inv_other.SignlessLaplacianMatrix.calculate(graph))
+            return Utils.second_largest_eigen(inv_other.SignlessLaplacianSpectrum.calculate(graph))
         else:
             return 0
 
@@ -502,8 +587,8 @@ class Largest2EigenD(InvariantNum):
     def calculate(graph):
         if nx.number_of_nodes(graph) < 2:
             return 0
-        elif nx.is_connected(graph):
-            return Utils.second_largest_eigen(inv_other.DistanceMatrix.calculate(graph))
+        elif inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.second_largest_eigen(inv_other.DistanceSpectrum.calculate(graph))
         else:
             return 10 ** 10
 
@@ -519,8 +604,8 @@ class Largest2EigenDL(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.second_largest_eigen(inv_other.LaplacianDistanceMatrix.calculate(graph))
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.second_largest_eigen(inv_other.LaplacianDistanceSpectrum.calculate(graph))
         else:
             return 10 ** 10
 
@@ -536,8 +621,8 @@ class Largest2EigenDQ(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.second_largest_eigen(inv_other.SignlessLaplacianMatrix.calculate(graph))
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.second_largest_eigen(inv_other.SignlessLaplacianSpectrum.calculate(graph))
         else:
             return 10 ** 10
 
@@ -554,7 +639,7 @@ class Largest2EigenN(InvariantNum):
     @staticmethod
     def calculate(graph):
         if nx.number_of_nodes(graph) > 1:
-            return Utils.second_largest_eigen(inv_other.NormalizedLaplacianMatrix.calculate(graph))
+            return Utils.second_largest_eigen(inv_other.NormalizedLaplacianSpectrum.calculate(graph))
         else:
             return 0
 
@@ -571,7 +656,7 @@ class Largest2EigenS(InvariantNum):
     @staticmethod
     def calculate(graph):
         if nx.number_of_nodes(graph) > 1:
-            return Utils.second_largest_eigen(inv_other.SeidelMatrix.calculate(graph))
+            return Utils.second_largest_eigen(inv_other.SeidelSpectrum.calculate(graph))
         else:
             return 0
 
@@ -587,8 +672,8 @@ class Largest2EigenE(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.second_largest_eigen(inv_other.EccentricityMatrix.calculate(graph))
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.second_largest_eigen(inv_other.EccentricitySpectrum.calculate(graph))
         else:
             return 10 ** 10
 
@@ -605,7 +690,7 @@ class Largest2EigenR(InvariantNum):
     @staticmethod
     def calculate(graph):
         if nx.number_of_nodes(graph) > 1:
-            return Utils.largest_eigen(inv_other.RandicMatrix.calculate(graph))
+            return Utils.largest_eigen(inv_other.RandicSpectrum.calculate(graph))
         else:
             return 0
 
@@ -621,7 +706,7 @@ class SmallestEigenA(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return Utils.smallest_eigen(inv_other.AdjacencyMatrix.calculate(graph))
+        return Utils.smallest_eigen(inv_other.AdjacencySpectrum.calculate(graph))
 
     @staticmethod
     def print(graph, precision):
@@ -635,7 +720,7 @@ class SmallestEigenL(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return Utils.smallest_eigen(inv_other.LaplacianMatrix.calculate(graph))
+        return Utils.smallest_eigen(inv_other.LaplacianSpectrum.calculate(graph))
 
     @staticmethod
     def print(graph, precision):
@@ -649,7 +734,7 @@ class SmallestEigenQ(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return Utils.smallest_eigen(inv_other.SignlessLaplacianMatrix.calculate(graph))
+        return Utils.smallest_eigen(inv_other.SignlessLaplacianSpectrum.calculate(graph))
 
     @staticmethod
     def print(graph, precision):
@@ -663,8 +748,8 @@ class SmallestEigenD(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.smallest_eigen(inv_other.DistanceMatrix.calculate(graph))
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.smallest_eigen(inv_other.DistanceSpectrum.calculate(graph))
         else:
             return 10 ** 10
 
@@ -680,8 +765,8 @@ class SmallestEigenDL(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.smallest_eigen(inv_other.LaplacianDistanceMatrix.calculate(graph))
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.smallest_eigen(inv_other.LaplacianDistanceSpectrum.calculate(graph))
         else:
             return 10 ** 10
 
@@ -697,8 +782,8 @@ class SmallestEigenDQ(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.smallest_eigen(inv_other.SignlessLaplacianDistanceMatrix.calculate(graph))
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.smallest_eigen(inv_other.SignlessLaplacianDistanceSpectrum.calculate(graph))
         else:
             return 10 ** 10
 
@@ -714,7 +799,7 @@ class SmallestEigenN(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return Utils.smallest_eigen(inv_other.NormalizedLaplacianMatrix.calculate(graph))
+        return Utils.smallest_eigen(inv_other.NormalizedLaplacianSpectrum.calculate(graph))
 
     @staticmethod
     def print(graph, precision):
@@ -728,7 +813,7 @@ class SmallestEigenS(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return Utils.smallest_eigen(inv_other.SeidelMatrix.calculate(graph))
+        return Utils.smallest_eigen(inv_other.SeidelSpectrum.calculate(graph))
 
     @staticmethod
     def print(graph, precision):
@@ -742,8 +827,8 @@ class SmallestEigenE(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.smallest_eigen(inv_other.EccentricityMatrix.calculate(graph))
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.smallest_eigen(inv_other.EccentricitySpectrum.calculate(graph))
         else:
             return 10 ** 10
 
@@ -759,7 +844,7 @@ class SmallestEigenR(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return Utils.smallest_eigen(inv_other.RandicMatrix.calculate(graph))
+        return Utils.smallest_eigen(inv_other.RandicSpectrum.calculate(graph))
 
     @staticmethod
     def print(graph, precision):
@@ -773,7 +858,8 @@ class AdjacencyEnergy(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return Utils.energy(inv_other.AdjacencyMatrix.calculate(graph))
+        return Utils.energy(inv_other.AdjacencyMatrix.calculate(graph),
+                            inv_other.AdjacencySpectrum.calculate(graph))
 
     @staticmethod
     def print(graph, precision):
@@ -787,7 +873,8 @@ class LaplacianEnergy(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return Utils.energy(inv_other.LaplacianMatrix.calculate(graph))
+        return Utils.energy(inv_other.LaplacianMatrix.calculate(graph),
+                            inv_other.LaplacianSpectrum.calculate(graph))
 
     @staticmethod
     def print(graph, precision):
@@ -801,7 +888,8 @@ class SignlessLaplacianEnergy(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return Utils.energy(inv_other.SignlessLaplacianMatrix.calculate(graph))
+        return Utils.energy(inv_other.SignlessLaplacianMatrix.calculate(graph),
+                            inv_other.SignlessLaplacianSpectrum.calculate(graph))
 
     @staticmethod
     def print(graph, precision):
@@ -815,8 +903,9 @@ class DistanceEnergy(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.energy(inv_other.DistanceMatrix.calculate(graph))
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.energy(inv_other.DistanceMatrix.calculate(graph),
+                                inv_other.DistanceSpectrum.calculate(graph))
         else:
             return 10 ** 10
 
@@ -832,8 +921,9 @@ class LaplacianDistanceEnergy(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.energy(inv_other.LaplacianDistanceMatrix.calculate(graph))
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.energy(inv_other.LaplacianDistanceMatrix.calculate(graph),
+                                inv_other.LaplacianDistanceSpectrum.calculate(graph))
         else:
             return 10 ** 10
 
@@ -849,8 +939,9 @@ class SignlessLaplacianDistanceEnergy(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.energy(inv_other.SignlessLaplacianMatrix.calculate(graph))
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.energy(inv_other.SignlessLaplacianMatrix.calculate(graph),
+                                inv_other.SignlessLaplacianSpectrum.calculate(graph))
         else:
             return 10 ** 10
 
@@ -866,7 +957,8 @@ class NormalizedLaplacianEnergy(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return Utils.energy(inv_other.NormalizedLaplacianMatrix.calculate(graph))
+        return Utils.energy(inv_other.NormalizedLaplacianMatrix.calculate(graph),
+                            inv_other.NormalizedLaplacianSpectrum.calculate(graph))
 
     @staticmethod
     def print(graph, precision):
@@ -880,7 +972,8 @@ class SeidelEnergy(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return Utils.energy(inv_other.SeidelMatrix.calculate(graph))
+        return Utils.energy(inv_other.SeidelMatrix.calculate(graph),
+                            inv_other.SeidelSpectrum.calculate(graph))
 
     @staticmethod
     def print(graph, precision):
@@ -894,8 +987,9 @@ class EccentricityEnergy(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.energy(inv_other.EccentricityMatrix.calculate(graph))
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.energy(inv_other.EccentricityMatrix.calculate(graph),
+                                inv_other.EccentricitySpectrum.calculate(graph))
         else:
             return 10 ** 10
 
@@ -911,7 +1005,8 @@ class RandicEnergy(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return Utils.energy(inv_other.RandicMatrix.calculate(graph))
+        return Utils.energy(inv_other.RandicMatrix.calculate(graph),
+                            inv_other.RandicSpectrum.calculate(graph))
 
     @staticmethod
     def print(graph, precision):
@@ -970,10 +1065,32 @@ class ChromaticIndex(InvariantNum):
     name = "Chromatic Index (estimated)"
     code = "\u03c7'"
     type = "number_structural"
+    # NOTE: vertices colored by the search for a coloring of the edges with Δ colors before it gives up
+    search_budget = 5000
 
     @staticmethod
     def calculate(graph):
-        return ChromaticNumber.calculate(nx.line_graph(graph))
+        # NOTE: by Vizing's theorem the chromatic index is Δ or Δ + 1, the search only decides whether Δ colors
+        #  color the line graph, starting from the edges of a vertex of maximum degree. When it exceeds its
+        #  budget, as it may for a graph that needs Δ + 1, the greedy estimate within those bounds is returned
+        if graph.number_of_edges() == 0:
+            return 1
+        line = oper.Line.calculate(graph)
+        center, maximum_degree = max(graph.degree, key=lambda node_degree: node_degree[1])
+        bits = BitsetGraph.of(line)
+        star = [i for i, edge in enumerate(bits.nodes) if center in edge]
+        colorable = bits.is_colorable(maximum_degree, star, ChromaticIndex.search_budget)
+        if colorable is None:
+            return min(maximum_degree + 1, ChromaticIndex.greedy_estimate(line))
+        return maximum_degree if colorable else maximum_degree + 1
+
+    @staticmethod
+    def greedy_estimate(graph):
+        strategies = [max(nx.greedy_color(graph, strategy='DSATUR').values()),
+                      max(nx.greedy_color(graph, strategy='largest_first', interchange=True).values()),
+                      max(nx.greedy_color(graph, strategy='smallest_last', interchange=True).values()),
+                      max(nx.greedy_color(graph, strategy='random_sequential', interchange=True).values())]
+        return round(min(strategies) + 1)
 
     @staticmethod
     def print(graph, precision):
@@ -988,14 +1105,16 @@ class MinimumEdgeCover(InvariantNum):
     @staticmethod
     def calculate(graph):
         if nx.number_of_isolates(graph) < 1 < nx.number_of_nodes(graph):
-            return len(nx.algorithms.covering.min_edge_cover(graph))
+            # NOTE: Gallai: a minimum edge cover is a maximum matching plus one edge for each vertex it misses
+            return nx.number_of_nodes(graph) - MatchingNumber.calculate(graph)
         else:
             return 10 ** 10
 
     @staticmethod
     def print(graph, precision):
         if nx.number_of_isolates(graph) < 1:
-            return Utils.print_set(nx.algorithms.covering.min_edge_cover(graph), precision)
+            return Utils.print_set(nx.algorithms.covering.min_edge_cover(
+                graph, matching_algorithm=lambda g: set(MatchingNumber.maximum_matching(g))), precision)
         else:
             return "Graph has isolate vertice."
 
@@ -1024,8 +1143,8 @@ class WienerIndex(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.approx_to_int(nx.wiener_index(graph))
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.approx_to_int(inv_other.DistanceMatrix.calculate(graph).sum() / 2)
         else:
             return 10 ** 10
 
@@ -1055,7 +1174,7 @@ class Nullity(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return nx.number_of_nodes(graph) - la.matrix_rank(inv_other.AdjacencyMatrix.calculate(graph), hermitian=True)
+        return nx.number_of_nodes(graph) - Utils.exact_rank_determinant(graph, inv_other.AdjacencyMatrix.calculate)[0]
 
     @staticmethod
     def print(graph, precision):
@@ -1067,18 +1186,10 @@ class NumberSpanningTree(InvariantNum):
     code = '\u0288'
     type = "number_structural"
 
-    @staticmethod
-    def submatrix(m):
-        n = m.shape[0]
-        new = np.zeros((n - 1, n - 1))
-        for i in range(0, n - 1):
-            for j in range(0, n - 1):
-                new[i, j] = m[i + 1, j + 1]
-        return new
-
     @staticmethod
     def calculate(graph):
-        return int(la.det(NumberSpanningTree.submatrix(nx.laplacian_matrix(graph))))
+        # NOTE: matrix-tree theorem, the number of spanning trees is any cofactor of the Laplacian
+        return Utils.exact_determinant(inv_other.LaplacianMatrix.calculate(graph)[1:, 1:])
 
     @staticmethod
     def print(graph, precision):
@@ -1106,11 +1217,12 @@ class MainEigenvalueAdjacency(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return len(Utils.main_eigenvalue(inv_other.AdjacencyMatrix.calculate(graph)))
+        return len(Utils.main_eigenvalue(Utils.eigendecomposition(graph, inv_other.AdjacencyMatrix.calculate)))
 
     @staticmethod
     def print(graph, precision):
-        return Utils.print_set(Utils.main_eigenvalue(inv_other.AdjacencyMatrix.calculate(graph)), precision)
+        decomposition = Utils.eigendecomposition(graph, inv_other.AdjacencyMatrix.calculate)
+        return Utils.print_set(Utils.main_eigenvalue(decomposition), precision)
 
 
 class MainEigenvalueDistance(InvariantNum):
@@ -1120,15 +1232,16 @@ class MainEigenvalueDistance(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return len(Utils.main_eigenvalue(inv_other.DistanceMatrix.calculate(graph)))
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return len(Utils.main_eigenvalue(Utils.eigendecomposition(graph, inv_other.DistanceMatrix.calculate)))
         else:
             return 0
 
     @staticmethod
     def print(graph, precision):
-        if nx.is_connected(graph):
-            return Utils.print_set(Utils.main_eigenvalue(inv_other.DistanceMatrix.calculate(graph)), precision)
+        if inv_other.DistanceMatrix.is_connected(graph):
+            decomposition = Utils.eigendecomposition(graph, inv_other.DistanceMatrix.calculate)
+            return Utils.print_set(Utils.main_eigenvalue(decomposition), precision)
         else:
             return 0
 
@@ -1140,11 +1253,12 @@ class MainEigenvalueSignlessLaplacian(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return len(Utils.main_eigenvalue(inv_other.SignlessLaplacianMatrix.calculate(graph)))
+        return len(Utils.main_eigenvalue(Utils.eigendecomposition(graph, inv_other.SignlessLaplacianMatrix.calculate)))
 
     @staticmethod
     def print(graph, precision):
-        return Utils.print_set(Utils.main_eigenvalue(inv_other.SignlessLaplacianMatrix.calculate(graph)), precision)
+        decomposition = Utils.eigendecomposition(graph, inv_other.SignlessLaplacianMatrix.calculate)
+        return Utils.print_set(Utils.main_eigenvalue(decomposition), precision)
 
 
 class MainEigenvalueSeidel(InvariantNum):
@@ -1154,11 +1268,12 @@ class MainEigenvalueSeidel(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return len(Utils.main_eigenvalue(inv_other.SeidelMatrix.calculate(graph)))
+        return len(Utils.main_eigenvalue(Utils.eigendecomposition(graph, inv_other.SeidelMatrix.calculate)))
 
     @staticmethod
     def print(graph, precision):
-        return Utils.print_set(Utils.main_eigenvalue(inv_other.SeidelMatrix.calculate(graph)), precision)
+        decomposition = Utils.eigendecomposition(graph, inv_other.SeidelMatrix.calculate)
+        return Utils.print_set(Utils.main_eigenvalue(decomposition), precision)
 
 
 class RankAdjacency(InvariantNum):
@@ -1169,7 +1284,7 @@ class RankAdjacency(InvariantNum):
     @staticmethod
     def calculate(graph):
         if nx.number_of_nodes(graph) > 1:
-            return la.matrix_rank(inv_other.AdjacencyMatrix.calculate(graph), hermitian=True)
+            return Utils.exact_rank_determinant(graph, inv_other.AdjacencyMatrix.calculate)[0]
         else:
             return 0
 
@@ -1186,7 +1301,7 @@ class RankLaplacian(InvariantNum):
     @staticmethod
     def calculate(graph):
         if nx.number_of_nodes(graph) > 1:
-            return la.matrix_rank(inv_other.LaplacianMatrix.calculate(graph), hermitian=True)
+            return Utils.exact_rank_determinant(graph, inv_other.LaplacianMatrix.calculate)[0]
         else:
             return 0
 
@@ -1203,7 +1318,7 @@ class RankSignlessLaplacian(InvariantNum):
     @staticmethod
     def calculate(graph):
         if nx.number_of_nodes(graph) > 1:
-            return la.matrix_rank(inv_other.SignlessLaplacianMatrix.calculate(graph), hermitian=True)
+            return Utils.exact_rank_determinant(graph, inv_other.SignlessLaplacianMatrix.calculate)[0]
         else:
             return 0
 
@@ -1221,8 +1336,8 @@ class RankDistance(InvariantNum):
     def calculate(graph):
         if nx.number_of_nodes(graph) < 2:
             return 0
-        if nx.is_connected(graph):
-            return la.matrix_rank(inv_other.DistanceMatrix.calculate(graph), hermitian=True)
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.exact_rank_determinant(graph, inv_other.DistanceMatrix.calculate)[0]
         else:
             return 10 ** 10
 
@@ -1240,8 +1355,8 @@ class RankLaplacianDistance(InvariantNum):
     def calculate(graph):
         if nx.number_of_nodes(graph) < 2:
             return 0
-        if nx.is_connected(graph):
-            return la.matrix_rank(inv_other.LaplacianDistanceMatrix.calculate(graph), hermitian=True)
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.exact_rank_determinant(graph, inv_other.LaplacianDistanceMatrix.calculate)[0]
         else:
             return 10 ** 10
 
@@ -1259,8 +1374,8 @@ class RankSignlessLaplacianDistance(InvariantNum):
     def calculate(graph):
         if nx.number_of_nodes(graph) < 2:
             return 0
-        if nx.is_connected(graph):
-            return la.matrix_rank(inv_other.SignlessLaplacianDistanceMatrix.calculate(graph), hermitian=True)
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.exact_rank_determinant(graph, inv_other.SignlessLaplacianDistanceMatrix.calculate)[0]
         else:
             return 10 ** 10
 
@@ -1294,7 +1409,7 @@ class RankSeidel(InvariantNum):
     @staticmethod
     def calculate(graph):
         if nx.number_of_nodes(graph) > 1:
-            return la.matrix_rank(inv_other.SeidelMatrix.calculate(graph), hermitian=True)
+            return Utils.exact_rank_determinant(graph, inv_other.SeidelMatrix.calculate)[0]
         else:
             return 0
 
@@ -1312,7 +1427,7 @@ class RankEccentricity(InvariantNum):
     def calculate(graph):
         if nx.number_of_nodes(graph) < 2:
             return 0
-        if nx.is_connected(graph):
+        if inv_other.DistanceMatrix.is_connected(graph):
             return la.matrix_rank(inv_other.EccentricityMatrix.calculate(graph), hermitian=True)
         else:
             return 10 ** 10
@@ -1329,7 +1444,7 @@ class DeterminantAdjacency(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return Utils.approx_to_int(la.det(inv_other.AdjacencyMatrix.calculate(graph)))
+        return Utils.exact_rank_determinant(graph, inv_other.AdjacencyMatrix.calculate)[1]
 
     @staticmethod
     def print(graph, precision):
@@ -1343,7 +1458,7 @@ class DeterminantLaplacian(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return Utils.approx_to_int(la.det(inv_other.LaplacianMatrix.calculate(graph)))
+        return Utils.exact_rank_determinant(graph, inv_other.LaplacianMatrix.calculate)[1]
 
     @staticmethod
     def print(graph, precision):
@@ -1357,7 +1472,7 @@ class DeterminantSignlessLaplacianMatrix(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return Utils.approx_to_int(la.det(inv_other.SignlessLaplacianMatrix.calculate(graph)))
+        return Utils.exact_rank_determinant(graph, inv_other.SignlessLaplacianMatrix.calculate)[1]
 
     @staticmethod
     def print(graph, precision):
@@ -1371,8 +1486,8 @@ class DeterminantDistance(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.approx_to_int(la.det(inv_other.DistanceMatrix.calculate(graph)))
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.exact_rank_determinant(graph, inv_other.DistanceMatrix.calculate)[1]
         else:
             return 10 ** 10
 
@@ -1388,8 +1503,8 @@ class DeterminantLaplacianDistance(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.approx_to_int(la.det(inv_other.LaplacianDistanceMatrix.calculate(graph)))
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.exact_rank_determinant(graph, inv_other.LaplacianDistanceMatrix.calculate)[1]
         else:
             return 10 ** 10
 
@@ -1405,8 +1520,8 @@ class DeterminantSignlessLaplacianDistance(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.approx_to_int(la.det(inv_other.SignlessLaplacianDistanceMatrix.calculate(graph)))
+        if inv_other.DistanceMatrix.is_connected(graph):
+            return Utils.exact_rank_determinant(graph, inv_other.SignlessLaplacianDistanceMatrix.calculate)[1]
         else:
             return 10 ** 10
 
@@ -1422,7 +1537,7 @@ class DeterminantSeidelMatrix(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        return Utils.approx_to_int(la.det(inv_other.SeidelMatrix.calculate(graph)))
+        return Utils.exact_rank_determinant(graph, inv_other.SeidelMatrix.calculate)[1]
 
     @staticmethod
     def print(graph, precision):
@@ -1450,7 +1565,7 @@ class DeterminantEccentricityMatrix(InvariantNum):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
+        if inv_other.DistanceMatrix.is_connected(graph):
             return Utils.approx_to_int(la.det(inv_other.EccentricityMatrix.calculate(graph)))
         return 10 ** 10
 
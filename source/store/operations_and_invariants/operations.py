@@ -1,6 +1,8 @@
 import networkx as nx
 import numpy as np
 
+from source.store.operations_and_invariants.invariants import GraphContext
+
 
 class MathOperations:
     code = None
@@ -66,6 +68,7 @@ class Complement(GraphOperations):
     is_a_function = True
 
     @staticmethod
+    @GraphContext.cached
     def calculate(graph):
         return nx.complement(graph)
 
@@ -76,6 +79,7 @@ class Line(GraphOperations):
     is_a_function = True
 
     @staticmethod
+    @GraphContext.cached
     def calculate(graph):
         return nx.line_graph(graph)
 
@@ -1,11 +1,9 @@
-import math
-
 import grinpy as gp
 import networkx as nx
 import numpy as np
 import scipy.sparse as ss
 
-from source.store.operations_and_invariants.invariants import Invariant
+from source.store.operations_and_invariants.invariants import GraphContext, Invariant
 from source.store.operations_and_invariants.invariants import UtilsToInvariants as Utils
 
 
@@ -37,6 +35,7 @@ class AdjacencyMatrix(InvariantOther):
     type = 'matrix'
 
     @staticmethod
+    @GraphContext.cached
     def calculate(graph):
         return ss.csc_matrix.toarray(nx.linalg.graphmatrix.adjacency_matrix(graph))
 
@@ -50,6 +49,7 @@ class IncidenceMatrix(InvariantOther):
     type = 'matrix'
 
     @staticmethod
+    @GraphContext.cached
     def calculate(graph):
         return ss.csc_matrix.toarray(nx.linalg.graphmatrix.incidence_matrix(graph))
 
@@ -63,6 +63,7 @@ class LaplacianMatrix(InvariantOther):
     type = 'matrix'
 
     @staticmethod
+    @GraphContext.cached
     def calculate(graph):
         return ss.csc_matrix.toarray(nx.linalg.laplacianmatrix.laplacian_matrix(graph))
 
@@ -76,6 +77,7 @@ class SignlessLaplacianMatrix(InvariantOther):
     type = 'matrix'
 
     @staticmethod
+    @GraphContext.cached
     def calculate(graph):
         return ss.csc_matrix.toarray(np.abs(nx.laplacian_matrix(graph)))
 
@@ -89,6 +91,7 @@ class NormalizedLaplacianMatrix(InvariantOther):
     type = 'matrix'
 
     @staticmethod
+    @GraphContext.cached
     def calculate(graph):
         return ss.csc_matrix.toarray(nx.linalg.laplacianmatrix.normalized_laplacian_matrix(graph))
 
@@ -102,8 +105,45 @@ class DistanceMatrix(InvariantOther):
     type = 'matrix'
 
     @staticmethod
-    def calculate(graph):
-        return nx.algorithms.shortest_paths.floyd_warshall_numpy(graph)
+    @GraphContext.cached
+    def calculate(graph):
+        # NOTE: the graphs are unweighted, so the distances come from a breadth-first search from every vertex at
+        #  once: the frontiers of all the searches advance one step per product with the adjacency matrix
+        index = {node: i for i, node in enumerate(graph)}
+        size = len(index)
+        adjacency = np.zeros((size, size))
+        for u, v in graph.edges():
+            adjacency[index[u], index[v]] = adjacency[index[v], index[u]] = 1
+        distance_matrix = np.full((size, size), np.inf)
+        reached = np.identity(size, dtype=bool)
+        frontier = reached
+        distance = 0
+        while frontier.any():
+            distance_matrix[frontier] = distance
+            frontier = (frontier @ adjacency > 0) & ~reached
+            reached = reached | frontier
+            distance += 1
+        return distance_matrix
+
+    @staticmethod
+    @GraphContext.cached
+    def is_connected(graph):
+        # NOTE: shortcut for the invariants of the distance family, which need the distance matrix anyway
+        if nx.number_of_nodes(graph) == 0:
+            raise nx.NetworkXPointlessConcept('Connectivity is undefined for the null graph.')
+        return bool(np.isfinite(DistanceMatrix.calculate(graph)).all())
+
+    @staticmethod
+    @GraphContext.cached
+    def eccentricities(graph):
+        # NOTE: None for a disconnected graph, so the connectivity and the eccentricities come from one distance
+        #  matrix even outside a GraphContext
+        if nx.number_of_nodes(graph) == 0:
+            raise nx.NetworkXPointlessConcept('Connectivity is undefined for the null graph.')
+        distance_matrix = DistanceMatrix.calculate(graph)
+        if np.isfinite(distance_matrix).all():
+            return distance_matrix.max(axis=1)
+        return None
 
     @staticmethod
     def print(graph, precision):
@@ -115,6 +155,7 @@ class SeidelMatrix(InvariantOther):
     type = 'matrix'
 
     @staticmethod
+    @GraphContext.cached
     def calculate(graph):
         n = nx.number_of_nodes(graph)
         j = np.empty([n, n])
@@ -131,8 +172,9 @@ class LaplacianDistanceMatrix(InvariantOther):
     type = 'matrix'
 
     @staticmethod
+    @GraphContext.cached
     def calculate(graph):
-        dist = nx.algorithms.shortest_paths.floyd_warshall_numpy(graph)
+        dist = DistanceMatrix.calculate(graph)
         trans = np.sum(dist, axis=1)
         dist_neg = np.multiply(-1, dist)
         np.fill_diagonal(dist_neg, trans)
@@ -148,8 +190,9 @@ class SignlessLaplacianDistanceMatrix(InvariantOther):
     type = 'matrix'
 
     @staticmethod
+    @GraphContext.cached
     def calculate(graph):
-        dist = nx.algorithms.shortest_paths.floyd_warshall_numpy(graph)
+        dist = DistanceMatrix.calculate(graph).copy()
         trans = np.sum(dist, axis=1)
         np.fill_diagonal(dist, trans)
         return dist
@@ -164,18 +207,14 @@ class EccentricityMatrix(InvariantOther):
     type = 'matrix'
 
     @staticmethod
+    @GraphContext.cached
     def calculate(graph):
-        distance_matrix = nx.algorithms.shortest_paths.floyd_warshall_numpy(graph)
-        if float('inf') not in distance_matrix:
-            size = len(graph.nodes)
-            eccentricity_matrix = np.zeros((size, size))
-            for i in range(size):
-                for j in range(i + 1, size):
-                    min_eccentricity = min(max(distance_matrix[i]), max(distance_matrix[j]))
-                    if min_eccentricity == distance_matrix[i][j]:
-                        eccentricity_matrix[i][j] = min_eccentricity
-                        eccentricity_matrix[j][i] = min_eccentricity
-            return eccentricity_matrix
+        distance_matrix = DistanceMatrix.calculate(graph)
+        if np.isfinite(distance_matrix).all():
+            # NOTE: a pair keeps its distance when it equals the smaller eccentricity of its two vertices
+            eccentricities = distance_matrix.max(axis=1)
+            min_eccentricity = np.minimum.outer(eccentricities, eccentricities)
+            return np.where(distance_matrix == min_eccentricity, min_eccentricity, 0.0)
 
         return 'Disconnected graph'
 
@@ -189,17 +228,13 @@ class RandicMatrix(InvariantOther):
     type = 'matrix'
 
     @staticmethod
+    @GraphContext.cached
     def calculate(graph):
-        adj = nx.adjacency_matrix(graph)
-        size = len(graph.nodes)
-        randic = np.zeros((size, size))
-        degree = gp.degree_sequence(graph)
-
-        for i in range(size):
-            for j in range(i + 1, size):
-                if adj[i, j] == 1:
-                    randic[i][j] = 1 / math.sqrt(degree[i] * degree[j])
-                    randic[j][i] = randic[i][j]
+        adjacent = AdjacencyMatrix.calculate(graph) == 1
+        np.fill_diagonal(adjacent, False)
+        degree = np.array(gp.degree_sequence(graph), dtype=float)
+        randic = np.zeros(adjacent.shape)
+        np.divide(1, np.sqrt(np.outer(degree, degree)), out=randic, where=adjacent)
         return randic
 
     @staticmethod
@@ -212,8 +247,9 @@ class AdjacencySpectrum(InvariantOther):
     type = 'list'
 
     @staticmethod
+    @GraphContext.cached
     def calculate(graph):
-        return Utils.spectrum(AdjacencyMatrix.calculate(graph))
+        return Utils.spectrum(Utils.eigenvalues(graph, AdjacencyMatrix.calculate))
 
     @staticmethod
     def print(graph, precision):
@@ -225,8 +261,9 @@ class LaplacianSpectrum(InvariantOther):
     type = 'list'
 
     @staticmethod
+    @GraphContext.cached
     def calculate(graph):
-        return Utils.spectrum(LaplacianMatrix.calculate(graph))
+        return Utils.spectrum(Utils.eigenvalues(graph, LaplacianMatrix.calculate))
 
     @staticmethod
     def print(graph, precision):
@@ -238,8 +275,9 @@ class SignlessLaplacianSpectrum(InvariantOther):
     type = 'list'
 
     @staticmethod
+    @GraphContext.cached
     def calculate(graph):
-        return Utils.spectrum(SignlessLaplacianMatrix.calculate(graph))
+        return Utils.spectrum(Utils.eigenvalues(graph, SignlessLaplacianMatrix.calculate))
 
     @staticmethod
     def print(graph, precision):
@@ -251,9 +289,10 @@ class DistanceSpectrum(InvariantOther):
     type = 'list'
 
     @staticmethod
+    @GraphContext.cached
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.spectrum(nx.floyd_warshall_numpy(graph))
+        if DistanceMatrix.is_connected(graph):
+            return Utils.spectrum(Utils.eigenvalues(graph, DistanceMatrix.calculate))
         else:
             return 'Disconnected graph'
 
@@ -267,9 +306,10 @@ class LaplacianDistanceSpectrum(InvariantOther):
     type = 'list'
 
     @staticmethod
+    @GraphContext.cached
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.spectrum(LaplacianDistanceMatrix.calculate(graph))
+        if DistanceMatrix.is_connected(graph):
+            return Utils.spectrum(Utils.eigenvalues(graph, LaplacianDistanceMatrix.calculate))
         else:
             return 'Disconnected graph'
 
@@ -283,9 +323,10 @@ class SignlessLaplacianDistanceSpectrum(InvariantOther):
     type = 'list'
 
     @staticmethod
+    @GraphContext.cached
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.spectrum(SignlessLaplacianDistanceMatrix.calculate(graph))
+        if DistanceMatrix.is_connected(graph):
+            return Utils.spectrum(Utils.eigenvalues(graph, SignlessLaplacianDistanceMatrix.calculate))
         else:
             return 'Disconnected graph'
 
@@ -299,8 +340,9 @@ class SeidelSpectrum(InvariantOther):
     type = 'list'
 
     @staticmethod
+    @GraphContext.cached
     def calculate(graph):
-        return Utils.spectrum(SeidelMatrix.calculate(graph))
+        return Utils.spectrum(Utils.eigenvalues(graph, SeidelMatrix.calculate))
 
     @staticmethod
     def print(graph, precision):
@@ -312,8 +354,9 @@ class RandicSpectrum(InvariantOther):
     type = 'list'
 
     @staticmethod
+    @GraphContext.cached
     def calculate(graph):
-        return Utils.spectrum(RandicMatrix.calculate(graph))
+        return Utils.spectrum(Utils.eigenvalues(graph, RandicMatrix.calculate))
 
     @staticmethod
     def print(graph, precision):
@@ -325,8 +368,9 @@ class NormalizedLaplacianSpectrum(InvariantOther):
     type = 'list'
 
     @staticmethod
+    @GraphContext.cached
     def calculate(graph):
-        return Utils.spectrum(NormalizedLaplacianMatrix.calculate(graph))
+        return Utils.spectrum(Utils.eigenvalues(graph, NormalizedLaplacianMatrix.calculate))
         # return Utils.approx_array_to_int(nx.linalg.spectrum.normalized_laplacian_spectrum(graph).tolist())
 
     @staticmethod
@@ -339,9 +383,10 @@ class EccentricitySpectrum(InvariantOther):
     type = 'list'
 
     @staticmethod
+    @GraphContext.cached
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.spectrum(EccentricityMatrix.calculate(graph))
+        if DistanceMatrix.is_connected(graph):
+            return Utils.spectrum(Utils.eigenvalues(graph, EccentricityMatrix.calculate))
         else:
             return 'Disconnected graph'
 
@@ -369,7 +414,7 @@ class AdjacencyEigenvectors(InvariantOther):
 
     @staticmethod
     def calculate(graph):
-        return Utils.eigenvectors(AdjacencyMatrix.calculate(graph))
+        return Utils.eigenvectors(Utils.eigendecomposition(graph, AdjacencyMatrix.calculate))
 
     @staticmethod
     def print(graph, precision):
@@ -382,7 +427,7 @@ class LaplacianEigenvectors(InvariantOther):
 
     @staticmethod
     def calculate(graph):
-        return Utils.eigenvectors(LaplacianMatrix.calculate(graph))
+        return Utils.eigenvectors(Utils.eigendecomposition(graph, LaplacianMatrix.calculate))
 
     @staticmethod
     def print(graph, precision):
@@ -395,7 +440,7 @@ class SignlessLaplacianEigenvectors(InvariantOther):
 
     @staticmethod
     def calculate(graph):
-        return Utils.eigenvectors(SignlessLaplacianMatrix.calculate(graph))
+        return Utils.eigenvectors(Utils.eigendecomposition(graph, SignlessLaplacianMatrix.calculate))
 
     @staticmethod
     def print(graph, precision):
@@ -408,7 +453,7 @@ class NormalizedLaplacianEigenvectors(InvariantOther):
 
     @staticmethod
     def calculate(graph):
-        return Utils.eigenvectors(NormalizedLaplacianMatrix.calculate(graph))
+        return Utils.eigenvectors(Utils.eigendecomposition(graph, NormalizedLaplacianMatrix.calculate))
 
     @staticmethod
     def print(graph, precision):
@@ -421,7 +466,7 @@ class SeidelEigenvectors(InvariantOther):
 
     @staticmethod
     def calculate(graph):
-        return Utils.eigenvectors(SeidelMatrix.calculate(graph))
+        return Utils.eigenvectors(Utils.eigendecomposition(graph, SeidelMatrix.calculate))
 
     @staticmethod
     def print(graph, precision):
@@ -434,8 +479,8 @@ class DistanceEigenvectors(InvariantOther):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.eigenvectors(DistanceMatrix.calculate(graph))
+        if DistanceMatrix.is_connected(graph):
+            return Utils.eigenvectors(Utils.eigendecomposition(graph, DistanceMatrix.calculate))
         else:
             return 'Disconnected graph'
 
@@ -450,8 +495,8 @@ class LaplacianDistanceEigenvectors(InvariantOther):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.eigenvectors(LaplacianDistanceMatrix.calculate(graph))
+        if DistanceMatrix.is_connected(graph):
+            return Utils.eigenvectors(Utils.eigendecomposition(graph, LaplacianDistanceMatrix.calculate))
         else:
             return 'Disconnected graph'
 
@@ -466,8 +511,8 @@ class SignlessLaplacianDistanceEigenvectors(InvariantOther):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.eigenvectors(SignlessLaplacianMatrix.calculate(graph))
+        if DistanceMatrix.is_connected(graph):
+            return Utils.eigenvectors(Utils.eigendecomposition(graph, SignlessLaplacianMatrix.calculate))
         else:
             return 'Disconnected graph'
 
@@ -482,8 +527,8 @@ class EccentricityEigenvectors(InvariantOther):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
-            return Utils.eigenvectors(EccentricityMatrix.calculate(graph))
+        if DistanceMatrix.is_connected(graph):
+            return Utils.eigenvectors(Utils.eigendecomposition(graph, EccentricityMatrix.calculate))
         else:
             return 'Disconnected graph'
 
@@ -498,7 +543,7 @@ class RandicEigenvectors(InvariantOther):
 
     @staticmethod
     def calculate(graph):
-        return Utils.eigenvectors(RandicMatrix.calculate(graph))
+        return Utils.eigenvectors(Utils.eigendecomposition(graph, RandicMatrix.calculate))
 
     @staticmethod
     def print(graph, precision):
@@ -579,7 +624,7 @@ class Transmission(InvariantOther):
 
     @staticmethod
     def calculate(graph):
-        if nx.is_connected(graph):
+        if DistanceMatrix.is_connected(graph):
             dist_matrix = DistanceMatrix.calculate(graph)
             trans = {}
             for i in range(0, dist_matrix.shape[0]):
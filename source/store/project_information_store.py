@@ -10,6 +10,8 @@ class ProjectInformationStore:
         self.temp_method = ""
         self.temp_graph_input_files = []
         self.temp_filtered_graphs = []
+        self.temp_parallel_mode = 'auto'
+        self.temp_number_workers = 0
         self.file_path = ""
         self.current_graph = None
         self.current_graph_pos = {}
@@ -22,6 +24,8 @@ class ProjectInformationStore:
         self.temp_method = ""
         self.temp_graph_input_files = []
         self.temp_filtered_graphs = []
+        self.temp_parallel_mode = 'auto'
+        self.temp_number_workers = 0
 
     def fill_data(self, data):
         self.temp_project_name = data['project_name']
@@ -32,6 +36,8 @@ class ProjectInformationStore:
         self.temp_method = data['method']
         self.temp_graph_input_files = data['graph_files']
         self.temp_filtered_graphs = data['filtered_graphs']
+        self.temp_parallel_mode = data.get('parallel_mode', 'auto')
+        self.temp_number_workers = data.get('number_workers', 0)
 
     def save_project(self):
         project_dictionary = {
@@ -42,7 +48,9 @@ class ProjectInformationStore:
             "conditions": self.temp_conditions,
             "method": self.temp_method,
             "graph_files": self.temp_graph_input_files,
-            "filtered_graphs": self.temp_filtered_graphs
+            "filtered_graphs": self.temp_filtered_graphs,
+            "parallel_mode": self.temp_parallel_mode,
+            "number_workers": self.temp_number_workers
         }
         project_json = json.dumps(project_dictionary)
 
@@ -85,7 +93,9 @@ def update_project_store():
         'conditions': wizard_information_store.temp_conditions.copy(),
         'method': wizard_information_store.temp_method,
         'graph_files': wizard_information_store.temp_graph_input_files.copy(),
-        'filtered_graphs': []
+        'filtered_graphs': [],
+        'parallel_mode': wizard_information_store.temp_parallel_mode,
+        'number_workers': wizard_information_store.temp_number_workers
     })
     project_information_store.file_path = wizard_information_store.file_path
     wizard_information_store.reset_store()
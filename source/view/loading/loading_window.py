@@ -8,6 +8,7 @@ class LoadingWindow(QDialog):
     def __init__(self):
         super().__init__()
         self.progressBar = QProgressBar(self)
+        self.throughput_label = QLabel(self)
         self.set_content_attributes()
         self.set_up_layout()
         self.is_forced_to_close = False
@@ -21,11 +22,15 @@ class LoadingWindow(QDialog):
     def set_up_layout(self):
         layout = QVBoxLayout()
         layout.addWidget(self.progressBar)
+        layout.addWidget(self.throughput_label)
         self.setLayout(layout)
 
     def increase_step(self, value):
         self.progressBar.setValue(value)
 
+    def set_throughput(self, examined_graphs, total_graphs, graphs_per_second):
+        self.throughput_label.setText(f"{examined_graphs} of {total_graphs} graphs ({graphs_per_second:.1f} graphs/s)")
+
     def closeEvent(self, event):
         if event.spontaneous():
             self.is_forced_to_close = True
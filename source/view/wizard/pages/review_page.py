@@ -25,6 +25,8 @@ class ReviewPage(QWizardPage):
         self.graph_files = []
         self.method = QLabel()
         self.equation = QLabel('<i>none</i>')
+        self.parallel_mode = QComboBox()
+        self.number_workers = QSpinBox()
         self.info = QLabel(
             'After the filtering is performed, two files will be generated:\n'
             '• A list of graphs (.g6 format) containing all the graphs that meet the filtering conditions. \n'
@@ -54,11 +56,23 @@ class ReviewPage(QWizardPage):
         self.project_layout.addRow("<b>(In)equations:</b>", self.equation)
         self.project_layout.addRow("<b>Conditions:</b>", self.conditions_layout)
         self.project_layout.addRow("<b>Graph files:</b>", self.graph_files_layout)
+        parallelism_layout = QHBoxLayout()
+        parallelism_layout.addWidget(self.parallel_mode)
+        parallelism_layout.addWidget(QLabel("Workers:"))
+        parallelism_layout.addWidget(self.number_workers)
+        self.project_layout.addRow("<b>Parallelism:</b>", parallelism_layout)
         self.project_layout.addRow("<b>Info: </b>",
                                    self.info )
 
         self.graph_files_layout.setSelectionMode(QAbstractItemView.NoSelection)
 
+        self.parallel_mode.addItem("Automatic", 'auto')
+        self.parallel_mode.addItem("Serial", 'serial')
+        self.parallel_mode.addItem("Threads", 'thread')
+        self.parallel_mode.addItem("Processes", 'process')
+        self.number_workers.setRange(0, 256)
+        self.number_workers.setSpecialValueText("Automatic")
+
         self.project_layout.setContentsMargins(60, 25, 60, 25)
         self.project_layout.setFieldGrowthPolicy(QFormLayout.AllNonFixedFieldsGrow)
         self.project_layout.setLabelAlignment(Qt.AlignLeft)
@@ -0,0 +1,53 @@
+import os
+import timeit
+
+import networkx as nx
+import numpy as np
+import numpy.linalg as la
+
+from source.store.operations_and_invariants import other_invariants as inv_other
+from source.store.operations_and_invariants.invariants import UtilsToInvariants as Utils
+
+
+# NOTE: the helpers as they were before they worked on whole arrays, kept to measure the saving per graph
+
+def approx_array_to_int(array):
+    for index, x in enumerate(array):
+        array[index] = Utils.approx_to_int(x)
+    return np.around(array, decimals=5)
+
+
+def integral(group):
+    for number in group:
+        if not Utils.approx_to_int(number).is_integer():
+            return False
+    return True
+
+
+def main_eigenvalue(decomposition):
+    eigenvalues = np.around(decomposition[0], decimals=10)
+    vectors = np.around(decomposition[1], decimals=10)
+    one = np.ones(vectors.shape[0])
+    mains = set()
+    for i, value in enumerate(eigenvalues):
+        if Utils.approx_to_int(np.dot(one, vectors[:, i])) != 0:
+            mains.add(value)
+    return mains
+
+
+def per_graph(decompositions, spectrum, is_integral, main):
+    for eigenvalues, vectors in decompositions:
+        is_integral(spectrum(eigenvalues))
+        main((eigenvalues, vectors))
+
+
+file_in = open(os.path.abspath('resources/graphs/graphs9.g6'), 'r')
+group = [nx.from_graph6_bytes(g6code.encode('utf-8')) for g6code in file_in.read().splitlines() if g6code]
+file_in.close()
+decompositions = [la.eigh(inv_other.AdjacencyMatrix.calculate(g)) for g in group]
+
+for name, helpers in [('before', (lambda eigenvalues: approx_array_to_int(eigenvalues.tolist()), integral,
+                                  main_eigenvalue)),
+                      ('after', (Utils.spectrum, Utils.integral, Utils.main_eigenvalue))]:
+    seconds = min(timeit.repeat(lambda: per_graph(decompositions, *helpers), number=5, repeat=5)) / 5
+    print(f'{name}: {seconds / len(group) * 10 ** 6:.1f} µs per graph')
@@ -1,4 +1,7 @@
 import os
+import pickle
+import threading
+import time
 import unittest
 import gzip
 
@@ -10,9 +13,12 @@ import source.store.operations_and_invariants.num_invariants as inv_num
 import source.store.operations_and_invariants.other_invariants as inv_other
 import source.store.operations_and_invariants.operations as oper
 
+from source.domain.checkpoint import Checkpoint
 from source.domain.equation import Equation
+from source.domain.evaluation_plan import Condition, EvaluationPlan
 from source.domain.filter_list import FilterList
-from source.store.operations_and_invariants.invariants import UtilsToInvariants
+from source.domain.parallel_plan import ParallelPlan
+from source.store.operations_and_invariants.invariants import GraphContext, UtilsToInvariants
 
 
 class Helper:
@@ -64,6 +70,36 @@ class ExpressionUnitTests(unittest.TestCase):
         self.assertEqual(expression_translated, Equation.split_translate_expression(expression2)[0])
         self.assertEqual(('', 'error'), Equation.split_translate_expression(expression3))
 
+    def test_compile_expression(self):
+        n = str(inv_num.NumberVertices.code)
+        edges = str(inv_num.NumberEdges.code)
+        c = str(oper.Complement.code)
+        compiled, and_or = Equation.compile_expression(f'{n}(G) == 5 AND {edges}({c}(G)) \u2265 {n}(G)')
+        self.assertEqual('AND', and_or)
+        self.assertEqual(2, len(compiled))
+        self.assertTrue(compiled[0](nx.path_graph(5)))
+        self.assertFalse(compiled[0](nx.path_graph(4)))
+        self.assertTrue(compiled[1](nx.path_graph(5)))
+        self.assertEqual(([], 'SINGLE'), Equation.compile_expression(''))
+        unpickled = pickle.loads(pickle.dumps(compiled[1]))
+        self.assertFalse(unpickled(nx.complete_graph(5)))
+
+    def test_compile_threshold_to_decision(self):
+        graphs = [nx.gnp_random_graph(9, 0.5, seed=seed) for seed in range(10)] + [nx.petersen_graph(), nx.Graph()]
+        for inv in [inv_num.CliqueNumber, inv_num.ChromaticNumber, inv_num.DominationNumber,
+                    inv_num.IndependenceNumber, inv_num.VertexCover]:
+            for comparison in ['<', '<=', '>', '>=', '==', '!=']:
+                for constant in ['0', '3', '3.5']:
+                    for expression in [f'{inv.code}(G) {comparison} {constant}',
+                                       f'{constant} {comparison} {inv.code}(G)']:
+                        compiled = Equation.compile_expression(expression)[0][0]
+                        self.assertIsNotNone(compiled.decision)
+                        for g in graphs:
+                            value = inv.calculate(g)
+                            self.assertEqual(eval(expression.replace(f'{inv.code}(G)', str(value))), compiled(g))
+        self.assertIsNone(Equation.compile_expression(f'{inv_num.CliqueNumber.code}(G) + 1 >= 3')[0][0].decision)
+        self.assertIsNone(Equation.compile_expression(f'{inv_num.NumberVertices.code}(G) >= 3')[0][0].decision)
+
     def test_translate_code_to_code_literal(self):
         inv_num.InvariantNum()
         oper.GraphOperations()
@@ -203,6 +239,336 @@ class DomainUnitTests(unittest.TestCase):
         graph_no_tree = 'ZGC?KA?_a?E??A?K?GWAQ?h?CA?GP?O@gH@CCg??WC?C?QOS?A@?@?]_A@r?'
         self.assertEqual(Helper.find_example('graphs1.g6', '', no_tree)[1][0], graph_no_tree)
 
+    def test_pool_keeps_input_order(self):
+        list_g6 = Helper.list_graphs_from('resources/graphs/graphs1.g6')
+        no_tree = {inv_bool.Tree.name: 'false'}
+        serial = FilterList()
+        serial.start_filter(list_g6, '', no_tree)
+        pool = FilterList()
+        pool.parallel_mode = 'process'
+        pool.start_filter(list_g6, '', no_tree)
+        self.assertEqual(serial.list_out, pool.list_out)
+        self.assertEqual([g6code for g6code in list_g6 if g6code in pool.list_out], pool.list_out)
+        self.assertTrue(pool.start_find_example(list_g6, '', no_tree))
+        self.assertIn(pool.list_out[0], serial.list_out)
+        threads = FilterList()
+        threads.parallel_mode = 'thread'
+        threads.number_workers = 3
+        threads.start_filter(list_g6, '', no_tree)
+        self.assertEqual(serial.list_out, threads.list_out)
+        self.assertEqual(len(list_g6), threads.count_examined())
+
+    def test_checkpoint_round_trip(self):
+        path = os.path.abspath('resources/test_checkpoint.json')
+        job = Checkpoint.job_of('filter', '', {inv_bool.Tree.name: 'false'}, ['a.g6', 'b.g6.gz'])
+        checkpoint = Checkpoint(path, job, [100, 50])
+        self.assertEqual(0, checkpoint.graphs_done())
+        try:
+            checkpoint.save(120, 300, 7)
+            self.assertEqual([100, 20], checkpoint.offsets)
+            loaded = Checkpoint.load(path, job, [100, 50])
+            self.assertEqual(([100, 20], 300, 7), (loaded.offsets, loaded.output_bytes, loaded.satisfied_graphs))
+            self.assertIsNone(Checkpoint.load(path, job, [100, 51]))
+            self.assertIsNone(Checkpoint.load(path, Checkpoint.job_of('find_example', '', {}, ['a.g6']), [100]))
+        finally:
+            checkpoint.remove()
+        self.assertFalse(os.path.exists(path))
+        self.assertIsNone(Checkpoint.load(path, job, [100, 50]))
+
+    def test_parallel_plan_calibration(self):
+        sample = [str(i) for i in range(64)]
+        plan = ParallelPlan.calibrate(lambda g6code: None, sample, 10 ** 6)
+        self.assertEqual('serial', plan.mode)
+        self.assertEqual(64, plan.sample_size)
+        ParallelPlan.spawn_seconds = 0.01
+        plan = ParallelPlan.calibrate(lambda g6code: time.sleep(0.001), sample, 10 ** 6, number_workers=4)
+        self.assertEqual(('process', 4), (plan.mode, plan.number_workers))
+        self.assertTrue(plan.mean_seconds >= 0.001 and plan.sample_size >= 2)
+        plan = ParallelPlan.calibrate(lambda g6code: time.sleep(0.001), sample, 3, number_workers=4)
+        self.assertEqual('serial', plan.mode)
+        plan = ParallelPlan.calibrate(None, sample, 10, 'thread', 2)
+        self.assertEqual(('thread', 2, True), (plan.mode, plan.number_workers, plan.forced))
+        ParallelPlan.spawn_seconds = None
+
+    def test_stream_writes_chunks_in_input_order(self):
+        list_g6 = Helper.list_graphs_from('resources/graphs/graphs1.g6')
+        no_tree = {inv_bool.Tree.name: 'false'}
+        serial = FilterList()
+        serial.start_filter(list_g6, '', no_tree)
+        chunks = (list_g6[i:i + 10] for i in range(0, len(list_g6), 10))
+        written = []
+        stream = FilterList()
+        stream.parallel_mode = 'process'
+        self.assertTrue(stream.start_stream('filter', chunks, len(list_g6), '', no_tree, written.append))
+        self.assertEqual(serial.list_out, [g6code for list_out in written for g6code in list_out])
+        self.assertEqual(len(serial.list_out), stream.satisfied_graphs)
+        self.assertEqual([], stream.list_out)
+        self.assertEqual(len(list_g6), stream.count_examined())
+
+    def test_find_example_stops_all_workers(self):
+        list_g6 = Helper.list_graphs_from('resources/graphs/graphs10.g6.gz')
+        for parallel_mode in ParallelPlan.modes:
+            ftl = FilterList()
+            ftl.parallel_mode = parallel_mode
+            self.assertTrue(ftl.start_find_example(list_g6, '', {}))
+            self.assertTrue(ftl.is_example_found.value)
+            self.assertEqual(1, len(ftl.list_out))
+            self.assertTrue(ftl.count_examined() < len(list_g6))
+
+    def test_cancelled_stream_keeps_partial_result(self):
+        list_g6 = Helper.list_graphs_from('resources/graphs/graphs10.g6.gz')
+        for parallel_mode in ParallelPlan.modes:
+            written = []
+            stream = FilterList()
+            stream.parallel_mode = parallel_mode
+
+            def write_and_cancel(list_out):
+                written.extend(list_out)
+                stream.is_forced_to_terminate.value = 1.0
+
+            chunks = (list_g6[i:i + 10] for i in range(0, len(list_g6), 10))
+            stream.start_stream('filter', chunks, len(list_g6), '', {}, write_and_cancel)
+            self.assertEqual(list_g6[:10], written[:10])
+            self.assertEqual(len(written), stream.satisfied_graphs)
+            self.assertEqual(len(written), stream.examined_in_output)
+            self.assertTrue(10 <= len(written) < len(list_g6))
+
+    def test_cancellable_serial_stream_stops_a_stuck_graph(self):
+        stuck = nx.to_graph6_bytes(nx.gnp_random_graph(300, 0.5, seed=1), header=False).decode().strip()
+        # NOTE: in auto mode the stuck graph is also the sample of the calibration
+        for mode in ['serial', 'auto']:
+            with self.subTest(mode=mode):
+                stream = FilterList()
+                stream.parallel_mode = mode
+                stream.is_cancellable = True
+                threading.Timer(0.5, lambda: setattr(stream.is_forced_to_terminate, 'value', 1.0)).start()
+                start = time.monotonic()
+                stream.start_stream('filter', [[stuck]], 1, f'{inv_num.ChromaticNumber.code}(G) + 0 > 1', {},
+                                    lambda list_out: None)
+                self.assertLess(time.monotonic() - start, 10)
+                self.assertEqual(0, stream.satisfied_graphs)
+
+    def test_graph_context_memoizes_artifacts(self):
+        g = nx.petersen_graph()
+        self.assertIsNot(inv_other.AdjacencySpectrum.calculate(g), inv_other.AdjacencySpectrum.calculate(g))
+        with GraphContext():
+            spectrum = inv_other.AdjacencySpectrum.calculate(g)
+            self.assertIs(spectrum, inv_other.AdjacencySpectrum.calculate(g))
+            self.assertIs(oper.Complement.calculate(g), oper.Complement.calculate(g))
+            self.assertFalse(inv_other.DistanceMatrix.calculate(g).flags.writeable)
+            self.assertEqual(inv_num.Largest1EigenA.calculate(g), spectrum[-1])
+            self.assertEqual(inv_num.SmallestEigenA.calculate(g), spectrum[0])
+        self.assertIsNone(GraphContext.current())
+        self.assertEqual(UtilsToInvariants.approx_to_int(3.0), inv_num.Largest1EigenA.calculate(g))
+
+    def test_spectral_invariants_share_eigendecomposition(self):
+        g = nx.petersen_graph()
+        with GraphContext():
+            decomposition = UtilsToInvariants.eigendecomposition(g, inv_other.AdjacencyMatrix.calculate)
+            self.assertIs(decomposition, UtilsToInvariants.eigendecomposition(g, inv_other.AdjacencyMatrix.calculate))
+            self.assertIs(decomposition[0], inv_other.AdjacencyEigenvectors.calculate(g)[0])
+            self.assertEqual([-2.0] * 4 + [1.0] * 5 + [3.0], list(inv_other.AdjacencySpectrum.calculate(g)))
+            self.assertEqual(1, inv_num.MainEigenvalueAdjacency.calculate(g))
+            self.assertTrue(inv_bool.IntegralA.calculate(g))
+            self.assertIsNot(decomposition, UtilsToInvariants.eigendecomposition(g, inv_other.LaplacianMatrix.calculate))
+
+    def test_distance_matrix_by_breadth_first_search(self):
+        graphs = [nx.gnp_random_graph(9, 0.3, seed=seed) for seed in range(10)] + [nx.petersen_graph()]
+        for g in graphs:
+            numpy.testing.assert_array_equal(nx.floyd_warshall_numpy(g), inv_other.DistanceMatrix.calculate(g))
+            self.assertEqual(nx.is_connected(g), inv_other.DistanceMatrix.is_connected(g))
+            if nx.is_connected(g):
+                self.assertEqual(nx.diameter(g), inv_num.Diameter.calculate(g))
+                self.assertEqual(nx.radius(g), inv_num.Radius.calculate(g))
+                self.assertEqual(nx.wiener_index(g), inv_num.WienerIndex.calculate(g))
+            else:
+                self.assertIsNone(inv_other.DistanceMatrix.eccentricities(g))
+                self.assertEqual(10 ** 10, inv_num.Radius.calculate(g))
+
+    def test_eccentricity_and_randic_matrices(self):
+        g = nx.path_graph(4)
+        numpy.testing.assert_array_equal([[0, 0, 2, 3], [0, 0, 0, 2], [2, 0, 0, 0], [3, 2, 0, 0]],
+                                         inv_other.EccentricityMatrix.calculate(g))
+        r = 1 / numpy.sqrt(2)
+        numpy.testing.assert_array_equal([[0, r, 0, 0], [r, 0, 0.5, 0], [0, 0.5, 0, r], [0, 0, r, 0]],
+                                         inv_other.RandicMatrix.calculate(g))
+        self.assertEqual('Disconnected graph', inv_other.EccentricityMatrix.calculate(nx.empty_graph(2)))
+        numpy.testing.assert_array_equal(numpy.zeros((2, 2)), inv_other.RandicMatrix.calculate(nx.empty_graph(2)))
+
+    def test_array_helpers_keep_tolerances(self):
+        spectrum = UtilsToInvariants.approx_array_to_int(numpy.array([-2.000000001, 0.1234567, 2.999999999]))
+        numpy.testing.assert_array_equal([-2.0, 0.12346, 3.0], spectrum)
+        zeros = UtilsToInvariants.approx_array_to_int(numpy.array([-1e-12, -0.000001]))
+        self.assertEqual(['0.0', '0.0'], [str(x) for x in zeros])
+        self.assertTrue(UtilsToInvariants.is_there_integer([0.5, 1.000001]))
+        self.assertFalse(UtilsToInvariants.is_there_integer([0.5, 1.0001]))
+        self.assertTrue(UtilsToInvariants.integral([1.000001, 0.999998, -3]))
+        self.assertFalse(UtilsToInvariants.integral([1.000001, 0.9999]))
+        decomposition = numpy.linalg.eigh(nx.to_numpy_array(nx.petersen_graph()))
+        self.assertEqual({3.0}, UtilsToInvariants.main_eigenvalue(decomposition))
+
+    def test_bitset_maximum_clique(self):
+        for seed in range(30):
+            g = nx.gnp_random_graph(14, [0.2, 0.5, 0.8][seed % 3], seed=seed)
+            clique_number = len(nx.max_weight_clique(g, weight=None)[0])
+            independence_number = len(nx.max_weight_clique(nx.complement(g), weight=None)[0])
+            self.assertEqual(clique_number, inv_num.CliqueNumber.calculate(g))
+            self.assertEqual(independence_number, inv_num.IndependenceNumber.calculate(g))
+            self.assertEqual(14 - independence_number, inv_num.VertexCover.calculate(g))
+        self.assertEqual('value= 4, set= {8, 9, 2, 0}', inv_num.IndependenceNumber.print(nx.petersen_graph(), 2))
+        self.assertEqual(0, inv_num.CliqueNumber.calculate(nx.null_graph()))
+        # NOTE: the numeric invariants are exported to sheets as float(print(...))
+        self.assertEqual(6.0, float(inv_num.VertexCover.print(nx.petersen_graph(), 5)))
+
+    def test_matching_without_line_graph(self):
+        for seed in range(20):
+            g = nx.gnp_random_graph(10, 0.4, seed=seed)
+            self.assertEqual(inv_num.IndependenceNumber.calculate(nx.line_graph(g)), inv_num.MatchingNumber.calculate(g))
+            if nx.number_of_isolates(g) == 0:
+                self.assertEqual(len(nx.min_edge_cover(g)), inv_num.MinimumEdgeCover.calculate(g))
+        g = nx.petersen_graph()
+        with GraphContext():
+            self.assertIs(inv_num.MatchingNumber.maximum_matching(g), inv_num.MatchingNumber.maximum_matching(g))
+            self.assertEqual(5, inv_num.MinimumEdgeCover.calculate(g))
+
+    def test_exact_chromatic_number(self):
+        for g, chromatic_number in [(nx.petersen_graph(), 3), (nx.mycielski_graph(4), 4), (nx.cycle_graph(5), 3),
+                                    (nx.complete_graph(6), 6), (nx.empty_graph(4), 1), (nx.path_graph(7), 2)]:
+            self.assertEqual(chromatic_number, inv_num.ChromaticNumber.calculate(g))
+            self.assertTrue(inv_num.ChromaticNumber.is_at_most(g, chromatic_number))
+            self.assertFalse(inv_num.ChromaticNumber.is_at_most(g, chromatic_number - 1))
+        self.assertEqual(3, inv_num.ChromaticIndex.calculate(nx.petersen_graph().subgraph(range(5))))
+        self.assertEqual(4, inv_num.ChromaticIndex.calculate(nx.petersen_graph()))
+        self.assertEqual(7, inv_num.ChromaticIndex.calculate(nx.complete_graph(8)))
+        self.assertEqual(9, inv_num.ChromaticIndex.calculate(nx.complete_graph(9)))
+
+    def test_girth(self):
+        self.assertEqual(5, inv_num.GirthNumber.calculate(nx.petersen_graph()))
+        self.assertEqual(6, inv_num.GirthNumber.calculate(nx.heawood_graph()))
+        self.assertEqual(4, inv_num.GirthNumber.calculate(nx.cycle_graph(4)))
+        self.assertEqual(3, inv_num.GirthNumber.calculate(nx.complete_graph(5)))
+        self.assertEqual(10 ** 10, inv_num.GirthNumber.calculate(nx.balanced_tree(2, 3)))
+        self.assertEqual(5, inv_num.GirthNumber.calculate(nx.disjoint_union(nx.path_graph(3), nx.cycle_graph(5))))
+
+    def test_domination_number(self):
+        for g, domination_number in [(nx.petersen_graph(), 3), (nx.cycle_graph(7), 3), (nx.star_graph(6), 1),
+                                     (nx.empty_graph(3), 3), (nx.path_graph(9), 3)]:
+            self.assertEqual(domination_number, inv_num.DominationNumber.calculate(g))
+            self.assertEqual(domination_number, len(inv_num.DominationNumber.minimum_dominating_set_ilp(g)))
+            self.assertTrue(nx.is_dominating_set(g, inv_num.DominationNumber.minimum_dominating_set(g)))
+            self.assertTrue(inv_num.DominationNumber.is_at_most(g, domination_number))
+            self.assertFalse(inv_num.DominationNumber.is_at_most(g, domination_number - 1))
+
+    def test_exact_number_spanning_trees(self):
+        for n in [2, 5, 12, 25]:
+            self.assertEqual(n ** (n - 2), inv_num.NumberSpanningTree.calculate(nx.complete_graph(n)))
+        self.assertEqual(2000, inv_num.NumberSpanningTree.calculate(nx.petersen_graph()))
+        self.assertEqual(0, inv_num.NumberSpanningTree.calculate(nx.empty_graph(3)))
+        self.assertEqual(-2, UtilsToInvariants.exact_determinant(numpy.array([[0, 1, 2], [1, 0, 3], [4, -3, 8]])))
+
+    def test_exact_rank_and_determinant(self):
+        g = nx.gnp_random_graph(10, 0.4, seed=8)
+        with GraphContext():
+            self.assertEqual(-28, inv_num.DeterminantAdjacency.calculate(g))
+            self.assertEqual(10, inv_num.RankAdjacency.calculate(g))
+            self.assertTrue(inv_bool.InvertibleMatrixA.calculate(g))
+        self.assertEqual(0, inv_num.DeterminantLaplacian.calculate(g))
+        self.assertFalse(inv_bool.InvertibleMatrixL.calculate(g))
+        self.assertEqual(9, inv_num.RankLaplacian.calculate(g))
+        self.assertEqual(0, inv_num.Nullity.calculate(nx.petersen_graph()))
+        self.assertEqual(4, inv_num.Nullity.calculate(nx.complete_bipartite_graph(2, 4)))
+        self.assertEqual((2, 0), UtilsToInvariants.exact_elimination(numpy.array([[0, 0, 1], [0, 0, 2], [1, 2, 0]])))
+        matrices = numpy.stack([nx.to_numpy_array(nx.gnp_random_graph(10, 0.4, seed=seed)) for seed in range(20)]
+                               + [inv_other.DistanceMatrix.calculate(nx.path_graph(10))])
+        self.assertEqual([UtilsToInvariants.bareiss_elimination(matrix) for matrix in matrices],
+                         UtilsToInvariants.exact_eliminations(matrices))
+        self.assertEqual((10, -28), UtilsToInvariants.exact_eliminations(matrices)[8])
+        graphs = [nx.gnp_random_graph(10, 0.3, seed=seed) for seed in range(20)]
+        expected = [inv_num.DeterminantAdjacency.calculate(g) for g in graphs]
+        with GraphContext(batch=graphs, min_requests=2) as context:
+            determinants = []
+            for g in graphs:
+                context.examined += 1
+                determinants.append(inv_num.DeterminantAdjacency.calculate(g))
+        self.assertEqual(expected, determinants)
+
+    def test_self_complementary(self):
+        paley = nx.Graph()
+        paley.add_nodes_from(range(13))
+        squares = {1, 3, 4, 9, 10, 12}
+        paley.add_edges_from((i, j) for i in range(13) for j in range(i + 1, 13) if (j - i) % 13 in squares)
+        self.assertTrue(inv_bool.SelfComplementary.calculate(paley))
+        self.assertTrue(inv_bool.SelfComplementary.calculate(nx.path_graph(4)))
+        self.assertTrue(inv_bool.SelfComplementary.calculate(nx.cycle_graph(5)))
+        self.assertFalse(inv_bool.SelfComplementary.calculate(nx.star_graph(3)))
+        for seed in range(100):
+            g = nx.gnp_random_graph(8, 0.5, seed=seed)
+            self.assertEqual(nx.is_isomorphic(g, nx.complement(g)), inv_bool.SelfComplementary.calculate(g))
+
+    def test_integrality_prefilter(self):
+        graphs = [nx.gnp_random_graph(8, 0.4, seed=seed) for seed in range(40)] + [nx.petersen_graph()]
+        for invariant, spectrum, matrix in [(inv_bool.IntegralA, inv_other.AdjacencySpectrum,
+                                             inv_other.AdjacencyMatrix),
+                                            (inv_bool.IntegralL, inv_other.LaplacianSpectrum,
+                                             inv_other.LaplacianMatrix),
+                                            (inv_bool.IntegralS, inv_other.SeidelSpectrum, inv_other.SeidelMatrix)]:
+            for g in graphs:
+                integral = UtilsToInvariants.integral(spectrum.calculate(g))
+                self.assertEqual(integral, invariant.calculate(g))
+                if integral:
+                    self.assertTrue(UtilsToInvariants.may_be_integral(matrix.calculate(g)))
+        self.assertTrue(UtilsToInvariants.may_be_integral(inv_other.AdjacencyMatrix.calculate(nx.petersen_graph())))
+        self.assertFalse(UtilsToInvariants.may_be_integral(inv_other.AdjacencyMatrix.calculate(nx.path_graph(4))))
+
+    def test_batched_eigendecomposition_matches_single(self):
+        graphs = [nx.gnp_random_graph(8, 0.4, seed=seed) for seed in range(20)] + [nx.path_graph(5)]
+        expected = [list(inv_other.DistanceSpectrum.calculate(g)) for g in graphs]
+        with GraphContext(batch=graphs, min_requests=2) as context:
+            spectra = []
+            for g in graphs:
+                context.examined += 1
+                spectra.append(list(inv_other.DistanceSpectrum.calculate(g)))
+            key = ('eigenvalues', inv_other.DistanceMatrix.calculate.__qualname__)
+            self.assertLess(context.requests[key], sum(nx.is_connected(g) for g in graphs))
+            self.assertFalse([key for _, key in context.values if key[0] == 'eigendecomposition'])
+        self.assertEqual(expected, spectra)
+
+    def test_batched_eigendecomposition_skips_disconnected_siblings(self):
+        graphs = [nx.gnp_random_graph(7, 0.35, seed=seed) for seed in range(40)]
+        self.assertTrue(any(not nx.is_connected(g) for g in graphs))
+        expected = [inv_bool.SomeEigenIntegerE.calculate(g) for g in graphs]
+        with GraphContext(batch=graphs, min_requests=2) as context:
+            results = []
+            for g in graphs:
+                context.examined += 1
+                results.append(inv_bool.SomeEigenIntegerE.calculate(g))
+        self.assertEqual(expected, results)
+
+    def test_evaluation_plan_orders_cheap_and_decisive_checks_first(self):
+        def slow(result):
+            def check(graph):
+                time.sleep(0.001)
+                return result
+            return check
+
+        def fails(graph):
+            raise ZeroDivisionError
+
+        g = nx.path_graph(3)
+        fast_false = Condition(inv_bool.Connected, 'false')
+        fast_true = Condition(inv_bool.Connected, 'true')
+        plan = EvaluationPlan([slow(True), fast_false], 'AND', warm_up=4)
+        self.assertEqual([False] * 10, [plan(g) for _ in range(10)])
+        self.assertIs(fast_false, plan.checks[0].function)
+        plan = EvaluationPlan([slow(False), fast_true], 'OR', warm_up=4)
+        self.assertEqual([True] * 10, [plan(g) for _ in range(10)])
+        self.assertIs(fast_true, plan.checks[0].function)
+        self.assertFalse(EvaluationPlan([fails, fast_true], 'AND')(g))
+        self.assertTrue(EvaluationPlan([fast_true, fails], 'OR')(g))
+        plan = EvaluationPlan([fails, fast_true], 'OR', warm_up=0)
+        plan.checks.reverse()
+        self.assertEqual([False] * 10, [plan(g) for _ in range(10)])
+
     def test_not_100percent_filter(self):
         diam = str(inv_num.Diameter.code)
         self.assertEqual(1 / 3, Helper.run('graphs9.g6', f'{diam}(G)==3', {}))